@@ -0,0 +1,51 @@
+"""Shared setup for the benchmark scripts, run them from the repository root"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+SRC = Path(__file__).resolve().parents[1] / "src" / "meteo_brussels"
+sys.path.insert(0, str(SRC))
+
+from standin.documents import make_reading
+from sensor_types import Reading, ReadingRecord
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 20) -> float:
+	"""Fastest wall time of `repeat` runs, in milliseconds"""
+	best = float("inf")
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		best = min(best, time.perf_counter() - start)
+	return best * 1000.0
+
+
+def traced(fn: Callable[[], Any]) -> tuple[Any, int, int]:
+	"""Runs fn under tracemalloc, returns its result, retained bytes and peak bytes"""
+	tracemalloc.start()
+	try:
+		result = fn()
+		retained, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+	return result, retained, peak
+
+
+def rss_mib() -> float:
+	"""Resident memory of this process right now, including what Qt allocates. Linux only"""
+	with open("/proc/self/statm") as statm:
+		return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def report(name: str, **values: float) -> None:
+	parts = ", ".join(f"{key}={value:.3f}" for (key, value) in values.items())
+	print(f"{name:<32} {parts}")
+
+
+def sample_reading(seed: int = 0, date: int = 1_760_000_000, graph_points: int = 0) -> ReadingRecord:
+	"""One synthetic reading, validated and copied into records like a fetched one"""
+	return ReadingRecord.from_model(Reading.model_validate(make_reading(random.Random(seed), date, graph_points=graph_points)))
@@ -0,0 +1,16 @@
+"""Scoring every EBBR runway configuration against one reading, as done on each refresh"""
+
+import _common
+from _common import best_of, report, sample_reading
+from runways.advisor import advise, EBBR_CONFIGURATIONS
+
+
+def main() -> None:
+	reading = sample_reading()
+	observations = len(reading.wind_sensor_detail) + len(reading.wind_forecast)
+	print(f"--- {len(EBBR_CONFIGURATIONS)} configurations, {observations} sensors and forecast slots")
+	report("advise", ms=best_of(lambda: advise(reading), repeat=200))
+
+
+if __name__ == "__main__":
+	main()
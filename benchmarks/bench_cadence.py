@@ -0,0 +1,168 @@
+"""
+Simulated polling of a server that publishes every `period` seconds, each publication up to `jitter` seconds late.
+PublicationCadence against the fixed 2 minute timer: requests sent, and how long a publication waits before a poll sees it.
+Then checks that it converges, backs off when publications stop, and stays within its request budget
+"""
+import random
+import sys
+from typing import Callable
+
+import _common
+from _common import report
+from api_calls.cadence import PublicationCadence
+
+DURATION = 6 * 3600.0
+FIXED_INTERVAL = 120.0
+POLL_DELAY = 10.0
+OFFSETS = (0.0, 13.0, 37.0, 59.0, 101.0)
+JITTERS = (0.0, 5.0, 20.0)
+
+
+def _publications(period: float, offset: float, jitter: float, rng: random.Random, until: float = DURATION) -> list[float]:
+	times = []
+	k = 0
+	while (base := offset + k * period) < until + period:
+		times.append(base + rng.uniform(0.0, jitter))
+		k += 1
+	return times
+
+
+def _simulate(publications: list[float], next_delay: Callable[[str | None, float], float], duration: float = DURATION, failure_rate: float = 0.0) -> tuple[list[float], list[tuple[float, float]]]:
+	"""
+	Polls until `duration`, a failed poll passes None as the label.
+	Returns the poll times, and (publication, seconds until the first poll that saw it) for every publication seen
+	"""
+	rng = random.Random(0)
+	polls = []
+	latencies = []
+	seen = -1
+	now = 0.0
+	while now < duration:
+		polls.append(now)
+		if rng.random() < failure_rate:
+			now += next_delay(None, now)
+			continue
+		latest = sum(1 for t in publications if t <= now) - 1
+		for idx in range(seen + 1, latest + 1):
+			latencies.append((publications[idx], now - publications[idx]))
+		seen = max(seen, latest)
+		now += next_delay(str(latest), now)
+	return (polls, latencies)
+
+
+def _learned(cadence: PublicationCadence) -> Callable[[str | None, float], float]:
+	def next_delay(label: str | None, now: float) -> float:
+		if label is None:
+			cadence.observe_failure(now)
+		else:
+			cadence.observe(label, now)
+		return cadence.next_poll(now)
+	return next_delay
+
+
+def _mean_latency(latencies: list[tuple[float, float]], since: float = 0.0) -> float:
+	after = [latency for (published, latency) in latencies if published >= since]
+	return sum(after) / len(after) if after else float("nan")
+
+
+def _busiest_hour(polls: list[float]) -> int:
+	return max(sum(1 for poll in polls if start <= poll < start + 3600.0) for start in polls)
+
+
+def compare() -> int:
+	worse = 0
+	for period in (120.0, 300.0, 600.0):
+		print(f"--- publication period {period:.0f}s, fixed timer {FIXED_INTERVAL:.0f}s, {DURATION / 3600:.0f}h")
+		for jitter in JITTERS:
+			fixed_requests, fixed_latency, learned_requests, learned_latency = 0, 0.0, 0, 0.0
+			for offset in OFFSETS:
+				publications = _publications(period, offset, jitter, random.Random(int(offset * 100 + jitter)))
+				(polls, latencies) = _simulate(publications, lambda _label, _now: FIXED_INTERVAL)
+				fixed_requests += len(polls)
+				fixed_latency += _mean_latency(latencies) / len(OFFSETS)
+
+				cadence = PublicationCadence(default_period=FIXED_INTERVAL, poll_delay=POLL_DELAY)
+				(polls, latencies) = _simulate(publications, _learned(cadence))
+				learned_requests += len(polls)
+				learned_latency += _mean_latency(latencies) / len(OFFSETS)
+
+			report(
+				f"jitter {jitter:.0f}s",
+				fixed_requests=fixed_requests / len(OFFSETS),
+				learned_requests=learned_requests / len(OFFSETS),
+				fixed_latency_s=fixed_latency,
+				learned_latency_s=learned_latency,
+			)
+			if learned_requests > fixed_requests or learned_latency >= fixed_latency:
+				worse += 1
+	if worse:
+		print(f"{worse} cases where learning polls more, or sees publications no sooner, than the fixed timer")
+	return worse
+
+
+def check_convergence() -> int:
+	"""Every 2 minutes: a provisional period within minutes, and after the first half, publications seen within half a minute"""
+	failed = 0
+	for jitter in JITTERS:
+		for offset in OFFSETS:
+			publications = _publications(120.0, offset, jitter, random.Random(int(offset * 100 + jitter)))
+			cadence = PublicationCadence(default_period=FIXED_INTERVAL, poll_delay=POLL_DELAY)
+			known_at = None
+			def next_delay(label: str | None, now: float) -> float:
+				nonlocal known_at
+				delay = _learned(cadence)(label, now)
+				if known_at is None and cadence.planning_period() is not None:
+					known_at = now
+				return delay
+			(_, latencies) = _simulate(publications, next_delay)
+			period = cadence.planning_period()
+			late = _mean_latency(latencies, since=DURATION / 2)
+			if known_at is None or known_at > 600.0 or period is None or abs(period - 120.0) > 1.0 or late > 30.0:
+				print(f"Not converged, jitter {jitter:.0f}s offset {offset:.0f}s: period known at {known_at}, {period}, latency {late:.1f}s")
+				failed += 1
+	report("converged at 2 minutes", cases=len(JITTERS) * len(OFFSETS) - failed, of=len(JITTERS) * len(OFFSETS))
+	return failed
+
+
+def check_back_off() -> int:
+	"""Publications stop after an hour: over the next three, at most half the fixed timer's polls, spaced out up to max_backoff"""
+	stall = 3 * 3600.0
+	publications = [t for t in _publications(120.0, 37.0, 5.0, random.Random(0)) if t < 3600.0]
+	cadence = PublicationCadence(default_period=FIXED_INTERVAL, poll_delay=POLL_DELAY)
+	(polls, _) = _simulate(publications, _learned(cadence), duration=3600.0 + stall)
+	stalled = [poll for poll in polls if poll >= 3600.0]
+	last_gap = stalled[-1] - stalled[-2]
+	report("publications stopped", polls=len(stalled), fixed_polls=stall / FIXED_INTERVAL, last_gap_s=last_gap)
+	if len(stalled) > stall / FIXED_INTERVAL / 2 or last_gap < cadence.max_backoff:
+		print("Did not back off after publications stopped")
+		return 1
+	return 0
+
+
+def check_budget() -> int:
+	"""Never more polls in any hour than the fixed timer's, plus what can be saved up, plus the retry that may be borrowed"""
+	limit = 3600.0 / FIXED_INTERVAL + PublicationCadence().burst + 1
+	busiest = 0
+	for period in (60.0, 120.0, 150.0, 300.0, 600.0):
+		for jitter in JITTERS:
+			for failure_rate in (0.0, 0.1):
+				publications = _publications(period, 37.0, jitter, random.Random(int(period + jitter)))
+				cadence = PublicationCadence(default_period=FIXED_INTERVAL, poll_delay=POLL_DELAY)
+				(polls, _) = _simulate(publications, _learned(cadence), failure_rate=failure_rate)
+				busiest = max(busiest, _busiest_hour(polls))
+	report("budget", busiest_hour=busiest, limit=limit)
+	if busiest > limit:
+		print("Polled more in an hour than the budget allows")
+		return 1
+	return 0
+
+
+def main() -> int:
+	failed = compare()
+	print("--- checks")
+	failed += check_convergence() + check_back_off() + check_budget()
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
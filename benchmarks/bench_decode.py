@@ -0,0 +1,37 @@
+"""response.json() followed by model_validate, against one-pass validate_json on the raw bytes"""
+import json
+
+import _common
+from _common import best_of, report
+from standin.documents import make_response
+from sensor_types import MeteoDocument, LazyMeteoDocument
+from api_calls import BatcAPI
+
+
+def dict_path(payload: bytes, lazy: bool) -> MeteoDocument | LazyMeteoDocument | None:
+	"""What BatcAPI.fetch_doc used to do"""
+	decoded = json.loads(payload)
+	if not isinstance(decoded, dict) or 'data' not in decoded.keys():
+		return None
+	if lazy:
+		return LazyMeteoDocument.model_validate(decoded['data'])
+	return MeteoDocument.model_validate(decoded['data'])
+
+
+def main() -> None:
+	api = BatcAPI()
+	for timepoints in (1, 12, 36):
+		payload = make_response(timepoints=timepoints)
+		print(f"--- {timepoints} timepoints, {len(payload) / 1024:.0f} KiB")
+
+		for lazy in (False, True):
+			api.lazy = lazy
+			mode = "lazy" if lazy else "eager"
+			assert api.decode_doc(payload) == dict_path(payload, lazy)
+
+			report(f"{mode} json+model_validate", ms=best_of(lambda: dict_path(payload, lazy)))
+			report(f"{mode} validate_json", ms=best_of(lambda: api.decode_doc(payload)))
+
+
+if __name__ == "__main__":
+	main()
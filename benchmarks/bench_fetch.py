@@ -0,0 +1,54 @@
+"""Latency of the whole BatcAPI fetch path against the local stand-in server"""
+import logging
+import statistics
+import time
+
+import requests as http
+import _common
+from _common import report
+from api_calls import BatcAPI
+from standin import Corpus, StandInConfig, StandInServer
+
+
+def run(corpus: Corpus, config: StandInConfig, requests: int = 50) -> None:
+	server = StandInServer(corpus, config)
+	server.start_in_thread()
+	try:
+		api = BatcAPI(server.url)
+		times = []
+		failures = 0
+		for _ in range(requests):
+			# A new document every request, so nothing is short-circuited
+			api._digest = api._etag = None
+			start = time.perf_counter()
+			try:
+				if api.fetch_latest() is None:
+					failures += 1
+			except http.RequestException:
+				# Like the worker does, e.g. the cookie page failed and is retried on the next fetch
+				failures += 1
+			times.append((time.perf_counter() - start) * 1000.0)
+		times.sort()
+		report(
+			f"{len(corpus.batc[0]) // 1024} KiB, {config.latency * 1000:.0f}ms",
+			p50_ms=statistics.median(times),
+			p95_ms=times[int(len(times) * 0.95) - 1],
+			failed=failures,
+		)
+	finally:
+		server.shutdown()
+		server.server_close()
+
+
+def main() -> None:
+	logging.getLogger("BatcAPI").setLevel(logging.ERROR)
+	for timepoints in (1, 12, 36):
+		corpus = Corpus.synthetic(count=2, timepoints=timepoints)
+		run(corpus, StandInConfig())
+		run(corpus, StandInConfig(latency=0.05, jitter=0.05))
+	print("--- 20% errors")
+	run(Corpus.synthetic(count=2, timepoints=12), StandInConfig(error_rate=0.2))
+
+
+if __name__ == "__main__":
+	main()
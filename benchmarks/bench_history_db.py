@@ -0,0 +1,49 @@
+"""Writing a week of 2 minute readings to the SQLite history, and reading all runways of it back"""
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import _common
+from _common import best_of, report
+from standin.documents import make_reading
+from sensor_types import Reading, ReadingRecord
+from history.database import HistoryDatabase
+
+START = 1_760_000_000
+WEEK = 7 * 24 * 3600
+STEP = 120
+
+
+def main() -> None:
+	rng = random.Random(0)
+	readings = [
+		ReadingRecord.from_model(Reading.model_validate(make_reading(rng, START + t, graph_points=0)))
+		for t in range(0, WEEK, STEP)
+	]
+
+	with tempfile.TemporaryDirectory() as directory:
+		database = HistoryDatabase(Path(directory) / "history.sqlite3", batch_size=500)
+		start = time.perf_counter()
+		for reading in readings:
+			database.write(reading)
+		queued = time.perf_counter() - start
+		database.flush()
+		written = time.perf_counter() - start
+
+		print(f"--- {len(readings)} readings, {len(readings[0].wind_sensor_detail)} sensors each")
+		report("write, time on caller", ms=queued * 1000)
+		report("write, until committed", ms=written * 1000)
+
+		keys = readings[0].runway_index.runway_keys
+		def load() -> int:
+			return sum(1 for key in keys for _ in database.samples(key, START, START + WEEK))
+
+		assert load() == len(readings) * len(keys)
+		report(f"load week, {len(keys)} runways", ms=best_of(load, repeat=5), rows=load())
+		report("load last hour, 1 runway", ms=best_of(lambda: list(database.samples(keys[0], START + WEEK - 3600))))
+		database.close()
+
+
+if __name__ == "__main__":
+	main()
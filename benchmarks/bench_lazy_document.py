@@ -0,0 +1,45 @@
+"""Eager MeteoDocument against LazyMeteoDocument, validated from the response bytes like BatcAPI does: time and memory"""
+import _common
+from _common import best_of, traced, report
+from standin.documents import make_response
+from api_calls import BatcAPI
+from sensor_types import MeteoDocument, LazyMeteoDocument
+
+
+def _every_timepoint(doc: MeteoDocument | LazyMeteoDocument | None) -> None:
+	assert doc is not None
+	for label in doc.rangeValues:
+		doc.reading(label)
+
+
+def main() -> None:
+	api = BatcAPI()
+	for timepoints in (12, 36, 72):
+		payload = make_response(timepoints=timepoints)
+		print(f"--- {timepoints} timepoints, {len(payload) / 1024:.0f} KiB")
+
+		docs = {}
+		for lazy in (False, True):
+			api.lazy = lazy
+			decode = lambda: api.decode_doc(payload)
+			doc, retained, peak = traced(decode)
+			assert doc is not None
+			docs[lazy] = doc
+			# What the app does with it, and what it would cost to look at every timepoint after all
+			current = lambda: api.get_latest_reading(api.decode_doc(payload))
+			every = lambda: _every_timepoint(api.decode_doc(payload))
+			report(
+				type(doc).__name__,
+				decode_ms=best_of(decode),
+				current_record_ms=best_of(current),
+				all_timepoints_ms=best_of(every),
+				retained_kib=retained / 1024,
+				peak_kib=peak / 1024,
+			)
+
+		for label in docs[False].rangeValues:
+			assert docs[True].reading(label) == docs[False].reading(label)
+
+
+if __name__ == "__main__":
+	main()
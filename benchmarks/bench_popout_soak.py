@@ -0,0 +1,106 @@
+"""
+Popping out a rose and closing it, 1,000 times, next to the main window's roses.
+Once with the PopOutRose the app uses, and once with a scene based WindRose in its own window.
+Memory, live widgets, store connections and the cost of a palette change should stay flat
+"""
+import os
+import resource
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _common
+from _common import best_of, report, sample_reading
+from PySide6.QtCore import QCoreApplication, QEvent, Qt
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QApplication, QWidget
+from store import ReadingStore
+from widgets.many_wind_roses import ManyWindRoses
+from widgets.wind_rose import WindRose
+from widgets.wind_rose.light import LightWindRose
+from widgets.wind_rose.popout import PopOutRose
+
+CYCLES = 1000
+CHECKPOINTS = (0, 100, 250, 500, 1000)
+
+
+def _settle() -> None:
+	QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+	QCoreApplication.processEvents()
+
+
+def _max_rss_mib() -> float:
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> int:
+	app = QApplication([])
+	store = ReadingStore()
+	store.set_reading(sample_reading())
+	reading = store.reading
+	assert reading is not None
+	keys = list(reading.runway_index.runway_keys)
+
+	roses = ManyWindRoses(store)
+	roses.set_reading(reading)
+	roses.set_show_keys(keys)
+	roses.show()
+	_settle()
+
+	palettes = (QPalette(QColor("#202020")), QPalette(QColor("#f0f0f0")))
+	flip = iter(range(1 << 30))
+	def change_palette() -> None:
+		app.setPalette(palettes[next(flip) % 2])
+		_settle()
+
+	def pop_out_light(key: str) -> QWidget:
+		popout = PopOutRose(key, reading.wind_sensor_detail[key].sensor_reading, store)
+		popped_out[key] = popout
+		popout.about_to_close.connect(lambda key=key: popped_out.pop(key, None))
+		return popout
+
+	def pop_out_scene(key: str) -> QWidget:
+		# What pop-outs were before LightWindRose, a scene based rose in its own window
+		rose = WindRose(can_pop_out=False)
+		rose.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+		rose.set_wind(reading.wind_sensor_detail[key].sensor_reading)
+		return rose
+
+	popped_out: dict[str, PopOutRose] = {}
+	grew = 0
+	for (name, pop_out) in (("PopOutRose", pop_out_light), ("WindRose", pop_out_scene)):
+		previous: tuple[int, int] | None = None
+		print(f"--- {len(keys)} roses in the main window, {CYCLES} {name} pop out/close cycles")
+		for cycle in range(CYCLES + 1):
+			if cycle in CHECKPOINTS:
+				# Both kinds, the main window paints LightWindRoses
+				counts = (
+					len([w for w in app.allWidgets() if isinstance(w, (WindRose, LightWindRose))]),
+					store.receivers("2sensor_changed(QString,PyObject)"),
+				)
+				report(
+					f"after {cycle} cycles",
+					max_rss_mib=_max_rss_mib(),
+					wind_roses=counts[0],
+					store_receivers=counts[1],
+					palette_ms=best_of(change_palette, repeat=10),
+				)
+				if previous is not None and (counts[0] > previous[0] or counts[1] > previous[1]):
+					grew += 1
+				previous = counts
+			if cycle == CYCLES:
+				break
+
+			window = pop_out(keys[cycle % len(keys)])
+			window.show()
+			_settle()
+			window.close()
+			_settle()
+
+	if grew:
+		print(f"Roses or store receivers grew at {grew} checkpoints, closed pop-outs are leaking")
+	return 1 if grew else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Memory held by 10,000 reading snapshots, as pydantic models and as the compact records the widgets use.
+Both are built from the JSON, so whatever the records keep of it, like the sensor graphs, counts against them
+"""
+import json
+import random
+
+import _common
+from _common import best_of, traced, report
+from standin.documents import make_reading
+from sensor_types import Reading, ReadingRecord
+
+SNAPSHOTS = 10_000
+GRAPH_POINTS = (0, 30)
+"""Without graphs, and with the 30 points standin sends, an hour at one point every 2 minutes"""
+
+
+def main() -> None:
+	for graph_points in GRAPH_POINTS:
+		rng = random.Random(0)
+		payloads = [json.dumps(make_reading(rng, 1_760_000_000 + i * 120, graph_points=graph_points)) for i in range(SNAPSHOTS)]
+
+		models, model_bytes, _ = traced(lambda: [Reading.model_validate_json(p) for p in payloads])
+		del models
+		# The models only live long enough to be copied, like in BatcAPI
+		records, record_bytes, _ = traced(lambda: [ReadingRecord.from_model(Reading.model_validate_json(p)) for p in payloads])
+		graphs = [detail.sensor_graph for detail in records[0].wind_sensor_detail.values() if detail.sensor_graph is not None]
+
+		print(f"--- {SNAPSHOTS} snapshots, {len(graphs)} runway graphs of {graph_points} points each")
+		report("pydantic models", MiB=model_bytes / 2**20, bytes_per_snapshot=model_bytes / SNAPSHOTS)
+		report("records", MiB=record_bytes / 2**20, bytes_per_snapshot=record_bytes / SNAPSHOTS)
+
+		one = Reading.model_validate_json(payloads[0])
+		report("Reading.model_validate_json", ms=best_of(lambda: Reading.model_validate_json(payloads[0]), repeat=200))
+		report("ReadingRecord.from_model", ms=best_of(lambda: ReadingRecord.from_model(one), repeat=200))
+		assert len(records) == SNAPSHOTS
+		del records
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,84 @@
+"""
+A window with 10 scene based roses dragged through a resize storm: a new size every event loop pass, like a window manager sends.
+Frames per second, and how many times the roses refitted and repainted per frame
+"""
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _common
+from _common import report, sample_reading
+from PySide6.QtCore import QCoreApplication, QEvent, QObject
+from PySide6.QtWidgets import QApplication, QGraphicsView, QGridLayout, QWidget
+from widgets.wind_rose import WindRose
+
+COUNT = 10
+FRAMES = 300
+
+
+class PaintCounter(QObject):
+	def __init__(self) -> None:
+		super().__init__()
+		self.paints = 0
+
+	def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+		if event.type() == QEvent.Type.Paint:
+			self.paints += 1
+		return False
+
+
+def main() -> None:
+	app = QApplication([])
+	reading = sample_reading()
+	sensors = [sensor.sensor_reading for sensor in reading.wind_sensor_detail.values()]
+
+	window = QWidget()
+	layout = QGridLayout(window)
+	roses = []
+	counter = PaintCounter()
+	for idx in range(COUNT):
+		rose = WindRose()
+		rose.set_wind(sensors[idx % len(sensors)])
+		rose.view.viewport().installEventFilter(counter)
+		layout.addWidget(rose, idx // 5, idx % 5)
+		roses.append(rose)
+	window.resize(1500, 800)
+	window.show()
+	QCoreApplication.processEvents()
+
+	fits = 0
+	fit_in_view = QGraphicsView.fitInView
+	def counted_fit(view: QGraphicsView, *args) -> None:
+		nonlocal fits
+		fits += 1
+		fit_in_view(view, *args)
+	QGraphicsView.fitInView = counted_fit # type: ignore[method-assign]
+
+	def storm(name: str, resizes_per_frame: int, data_every: int) -> None:
+		nonlocal fits
+		fits = 0
+		counter.paints = 0
+		start = time.perf_counter()
+		for frame in range(FRAMES):
+			for step in range(resizes_per_frame):
+				offset = (frame * resizes_per_frame + step) % 60
+				window.resize(1500 - offset * 10, 800 - offset * 5)
+			if data_every and frame % data_every == 0:
+				for rose in roses:
+					rose.set_wind(sensors[frame % len(sensors)])
+			QCoreApplication.processEvents()
+		elapsed = time.perf_counter() - start
+		report(name, fps=FRAMES / elapsed, fits_per_frame=fits / FRAMES, paints_per_frame=counter.paints / FRAMES)
+
+	print(f"--- {COUNT} roses, {FRAMES} frames")
+	storm("1 resize per frame", 1, 0)
+	# The event loop fell behind, several resizes wait for one pass
+	storm("4 resizes per frame", 4, 0)
+	# New data every 10 frames while resizing
+	storm("1 resize, data every 10", 1, 10)
+	storm("data every frame, no resize", 0, 1)
+
+
+if __name__ == "__main__":
+	main()
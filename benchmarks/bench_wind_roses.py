@@ -0,0 +1,65 @@
+"""
+The scene based WindRose against the painted LightWindRose, for a window showing many of them:
+building and filling them, the memory they take, and repainting all of them
+"""
+import gc
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _common
+from _common import best_of, report, rss_mib, sample_reading
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication, QGridLayout, QWidget
+from sensor_types import SensorRecord
+from widgets.wind_rose import WindRose
+from widgets.wind_rose.light import LightWindRose
+
+COUNT = 24
+COLUMNS = 6
+
+
+def _build(kind: type[WindRose] | type[LightWindRose], readings: list[SensorRecord]) -> QWidget:
+	container = QWidget()
+	layout = QGridLayout(container)
+	for (idx, reading) in enumerate(readings):
+		rose = kind()
+		rose.set_wind(reading)
+		layout.addWidget(rose, idx // COLUMNS, idx % COLUMNS)
+	container.resize(COLUMNS * 260, (COUNT // COLUMNS) * 330)
+	return container
+
+
+def main() -> None:
+	app = QApplication([])
+	reading = sample_reading()
+	sensors = [sensor.sensor_reading for sensor in reading.wind_sensor_detail.values()]
+	readings = [sensors[idx % len(sensors)] for idx in range(COUNT)]
+	# Warm up fonts, styles and the dial cache so neither kind pays for them
+	_build(WindRose, readings[:1]).show()
+	_build(LightWindRose, readings[:1]).show()
+	QCoreApplication.processEvents()
+
+	print(f"--- {COUNT} roses, {COLUMNS} per row")
+	kept = []
+	for kind in (WindRose, LightWindRose):
+		gc.collect()
+		before = rss_mib()
+		container = _build(kind, readings)
+		grown = rss_mib() - before
+		kept.append(container)
+		container.show()
+		QCoreApplication.processEvents()
+
+		report(
+			kind.__name__,
+			build_ms=best_of(lambda: _build(kind, readings).deleteLater(), repeat=5),
+			rss_mib=grown,
+			repaint_ms=best_of(container.repaint, repeat=20),
+			set_wind_ms=best_of(lambda: [rose.set_wind(sensors[0]) for rose in container.findChildren(kind)], repeat=20),
+		)
+		QCoreApplication.processEvents()
+
+
+if __name__ == "__main__":
+	main()
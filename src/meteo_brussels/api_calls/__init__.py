@@ -1,49 +1,210 @@
 import requests
+import hashlib
 import logging
+import threading
+from dataclasses import dataclass
 from typing import Any
-from sensor_types import Reading, MeteoDocument
+from metar import Metar
+from pydantic import TypeAdapter, ValidationError
+from sensor_types import ReadingRecord, MeteoDocument, LazyMeteoDocument, BatcEnvelope, LazyBatcEnvelope
+from .cache import ResponseCache
 
-PAGE_URL = "https://www.batc.be/en/meteo/meteo-readings"
-API_URL = "https://www.batc.be/en/api/visualisation/meteo"
+BATC_BASE_URL = "https://www.batc.be"
+PAGE_PATH = "/en/meteo/meteo-readings"
+API_PATH = "/en/api/visualisation/meteo"
+METAR_BASE_URL = "https://metar.vatsim.net"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:144.0) Gecko/20100101 Firefox/144.0"
 FAKE_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "User-Agent": USER_AGENT,
     "DNT": "1",
 }
+TIMEOUT = (5.0, 20.0)
+"""Connect and read timeout in seconds, so a stuck request can't hold a worker forever"""
+METAR_TIMEOUT = (3.0, 10.0)
+
+# Building the validators is not free, do it once
+_ENVELOPE = TypeAdapter(BatcEnvelope)
+_LAZY_ENVELOPE = TypeAdapter(LazyBatcEnvelope)
+
+@dataclass(frozen=True)
+class FetchResult:
+	label: str
+	reading: ReadingRecord
+	changed: bool = True
+	"""False when the server sent the same document as last time"""
+	fetched_at: float | None = None
+	"""Only set for results read back from the on-disk cache"""
 
 class BatcAPI():
-	session: requests.Session = requests.Session()
+	session: requests.Session
 	log = logging.getLogger("BatcAPI")
+	_has_cookies: bool = False
+	lazy: bool = True
+	"""
+	Only validate the current timepoint, see LazyMeteoDocument. The others are only validated if asked for,
+	and nothing here asks. Set to False to validate every timepoint as the response comes in
+	"""
+
+	_etag: str | None = None
+	_last_modified: str | None = None
+	_digest: bytes | None = None
+	_doc: MeteoDocument | LazyMeteoDocument | None = None
+
+	cache: ResponseCache | None = None
+
+	def __init__(self, base_url: str = BATC_BASE_URL) -> None:
+		self.session = requests.Session()
+		self.page_url = base_url.rstrip("/") + PAGE_PATH
+		self.api_url = base_url.rstrip("/") + API_PATH
+		self._lock = threading.Lock()
+		"""_digest and _doc change together, from the fetch worker and from load_cached on the GUI thread. The validators only with them"""
 
 	def setup_cookies(self) -> None:
 		"""The purpose of this is to set up some plausibly deniable cookies for the following requests"""
-		response = self.session.get(PAGE_URL, headers=FAKE_HEADERS)
+		response = self.session.get(self.page_url, headers=FAKE_HEADERS, timeout=TIMEOUT)
 		self.log.info(f"Setup request got {response.status_code}")
+		# Raises, and so is retried on the next fetch, unless the page actually loaded
+		response.raise_for_status()
+		self._has_cookies = True
 
-	def fetch_doc(self) -> MeteoDocument | None:
-		response = self.session.get(API_URL, headers=FAKE_HEADERS)
+	def fetch_doc(self) -> MeteoDocument | LazyMeteoDocument | None:
+		"""
+		Returns the previous document object itself when the server says it's not modified,
+		or when the body hashes the same, so nothing gets decoded twice
+		"""
+		response = self.session.get(self.api_url, headers=self._request_headers(), timeout=TIMEOUT)
+		with self._lock:
+			previous = self._doc
+		if response.status_code == 304 and previous is not None:
+			self.log.debug("Document not modified")
+			return previous
 		if response.status_code != 200:
 			self.log.warning(f"Bad response from api, got status: {response.status_code} and {response.request.headers}")
 			return None
-		json =  response.json()
-		if not isinstance(json, dict) or'data' not in json.keys():
+
+		digest = hashlib.blake2b(response.content, digest_size=16).digest()
+		with self._lock:
+			if digest == self._digest and self._doc is not None:
+				self.log.debug("Document unchanged")
+				self._keep_validators(response)
+				return self._doc
+
+		doc = self.decode_doc(response.content)
+		if doc is None:
+			# Keep the old validators, a 304 must not stand for a body we couldn't use
+			return None
+
+		with self._lock:
+			self._digest = digest
+			self._doc = doc
+			self._keep_validators(response)
+		if self.cache:
+			self.cache.store("batc", response.content)
+		return doc
+
+	def decode_doc(self, content: bytes) -> MeteoDocument | LazyMeteoDocument | None:
+		"""Validates a raw API response body in a single pass, without going through Python dicts first"""
+		try:
+			if self.lazy:
+				return _LAZY_ENVELOPE.validate_json(content).data
+			return _ENVELOPE.validate_json(content).data
+		except ValidationError as e:
+			self.log.warning(f"Could not decode document: {e.error_count()} errors, first: {e.errors()[0]['msg']}")
 			return None
-		return MeteoDocument.model_validate(json['data'])
 
-	def get_latest_reading(self, fetched: MeteoDocument | None = None) -> Reading | None:
+	def _keep_validators(self, response: requests.Response) -> None:
+		"""Only for a body that decoded, so a 304 always means the document we have"""
+		self._etag = response.headers.get("ETag")
+		self._last_modified = response.headers.get("Last-Modified")
+
+	def _request_headers(self) -> dict[str, str]:
+		headers = dict(FAKE_HEADERS)
+		if self._etag:
+			headers["If-None-Match"] = self._etag
+		if self._last_modified:
+			headers["If-Modified-Since"] = self._last_modified
+		return headers
+
+	def get_latest_reading(self, fetched: MeteoDocument | LazyMeteoDocument | None = None) -> ReadingRecord | None:
 		data = fetched or self.fetch_doc()
 		if not data:
 			return None
-		return data.timepoints[data.currentLabel]
+		return data.record(data.currentLabel)
+
+	def fetch_latest(self) -> FetchResult | None:
+		"""
+		Blocking, does the whole request, decode and validate round trip.
+		Meant to be run off the GUI thread, see api_calls.worker
+		"""
+		if not self._has_cookies:
+			self.setup_cookies()
+
+		with self._lock:
+			previous = self._doc
+		doc = self.fetch_doc()
+		if doc is None:
+			return None
+
+		reading = self.get_latest_reading(doc)
+		if reading is None:
+			return None
+
+		return FetchResult(doc.currentLabel, reading, changed=doc is not previous)
+
+	def load_cached(self) -> FetchResult | None:
+		"""The last good document from the on-disk cache, if there is one that hasn't expired"""
+		if not self.cache or not (entry := self.cache.load("batc")):
+			return None
+
+		doc = self.decode_doc(entry.payload)
+		reading = self.get_latest_reading(doc) if doc else None
+		if doc is None or reading is None:
+			return None
+
+		# A fresh fetch with the same body can then skip decoding, unless one already came in
+		digest = hashlib.blake2b(entry.payload, digest_size=16).digest()
+		with self._lock:
+			if self._digest is None:
+				self._digest = digest
+				self._doc = doc
+		return FetchResult(doc.currentLabel, reading, fetched_at=entry.fetched_at)
 
 	def close(self):
          self.session.close()
 
 
 class MetarAPI():
+	log = logging.getLogger("MetarAPI")
+	cache: ResponseCache | None = None
+
+	def __init__(self, base_url: str = METAR_BASE_URL) -> None:
+		self.session = requests.Session()
+		self.base_url = base_url.rstrip("/")
+
 	def get(self, icao: str) -> str | None:
-		response = requests.get(f"https://metar.vatsim.net/{icao}")
+		response = self.session.get(f"{self.base_url}/{icao}", timeout=METAR_TIMEOUT)
 		if response.ok:
+			if self.cache:
+				self.cache.store(f"metar-{icao}", response.content)
 			return response.text
-		return None
\ No newline at end of file
+		return None
+
+	def get_parsed(self, icao: str) -> Metar.Metar | None:
+		"""Blocking fetch and decode, meant to be run off the GUI thread"""
+		return self._parse(self.get(icao))
+
+	def load_cached(self, icao: str) -> Metar.Metar | None:
+		if not self.cache or not (entry := self.cache.load(f"metar-{icao}")):
+			return None
+		return self._parse(entry.payload.decode(errors="replace"))
+
+	def _parse(self, text: str | None) -> Metar.Metar | None:
+		if not text:
+			return None
+
+		try:
+			return Metar.Metar(text.strip())
+		except Metar.ParserError as e:
+			self.log.warning(f"Could not parse METAR {text!r}: {e}")
+			return None
@@ -0,0 +1,136 @@
+import base64
+import bisect
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+class Archive():
+	"""
+	Raw responses on disk, one JSON line per response in <stream>.jsonl, in the order they were received.
+	Each line has the receive time, request path, status, a few headers and the body, base64 encoded so it replays byte for byte
+	"""
+	log = logging.getLogger("Archive")
+
+	def __init__(self, directory: Path) -> None:
+		self.directory = directory
+		self._lock = threading.Lock()
+		self._entries: dict[tuple[str, str], list[dict]] = {}
+		self._times: dict[tuple[str, str], list[float]] = {}
+
+	def append(self, stream: str, received_at: float, path: str, response: requests.Response) -> None:
+		entry = {
+			"t": received_at,
+			"path": path,
+			"status": response.status_code,
+			"headers": {key: response.headers[key] for key in ("Content-Type", "ETag", "Last-Modified") if key in response.headers},
+			"body_b64": base64.b64encode(response.content).decode("ascii"),
+		}
+		line = json.dumps(entry, ensure_ascii=False) + "\n"
+		with self._lock:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			with open(self.directory / f"{stream}.jsonl", "a", encoding="utf-8") as f:
+				f.write(line)
+
+	def load(self) -> None:
+		"""Reads every stream into memory for replay"""
+		for path in sorted(self.directory.glob("*.jsonl")):
+			stream = path.stem
+			with open(path, encoding="utf-8") as f:
+				for line in f:
+					if not line.strip():
+						continue
+					entry = json.loads(line)
+					if entry["status"] == 304:
+						continue # Replay serves the full body it stood for instead
+					key = (stream, entry["path"])
+					self._entries.setdefault(key, []).append(entry)
+					self._times.setdefault(key, []).append(entry["t"])
+		self.log.info(f"Loaded {sum(len(v) for v in self._entries.values())} responses from {self.directory}")
+
+	def start_time(self) -> float | None:
+		starts = [times[0] for times in self._times.values() if times]
+		return min(starts) if starts else None
+
+	def latest(self, stream: str, path: str, at: float) -> dict | None:
+		"""The last response received for this path at or before the given time"""
+		key = (stream, path)
+		times = self._times.get(key)
+		if not times:
+			return None
+		idx = bisect.bisect_right(times, at) - 1
+		return self._entries[key][max(idx, 0)]
+
+def _body(entry: dict) -> bytes:
+	if "body_b64" in entry:
+		return base64.b64decode(entry["body_b64"])
+	# Archives recorded before bodies were stored as base64 have it as text
+	return entry["body"].encode("utf-8")
+
+class SimulatedClock():
+	"""Archive time, starting at `start` and running `speed` times faster than the wall clock"""
+	def __init__(self, start: float, speed: float = 1.0) -> None:
+		self.start = start
+		self.speed = speed
+		self._origin = time.monotonic()
+
+	def now(self) -> float:
+		return self.start + (time.monotonic() - self._origin) * self.speed
+
+class RecordingAdapter(HTTPAdapter):
+	"""Does the real request, then appends the response to an archive"""
+	def __init__(self, archive: Archive, stream: str) -> None:
+		super().__init__()
+		self.archive = archive
+		self.stream = stream
+
+	def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:
+		response = super().send(request, *args, **kwargs)
+		self.archive.append(self.stream, time.time(), urlsplit(request.url).path, response)
+		return response
+
+class ReplayAdapter(BaseAdapter):
+	"""Answers every request with what the archive had received by the simulated time, without touching the network"""
+	def __init__(self, archive: Archive, stream: str, clock: SimulatedClock) -> None:
+		super().__init__()
+		self.archive = archive
+		self.stream = stream
+		self.clock = clock
+
+	def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:
+		entry = self.archive.latest(self.stream, urlsplit(request.url).path, self.clock.now())
+
+		response = requests.Response()
+		response.request = request
+		response.url = request.url or ""
+		response.encoding = "utf-8"
+		if entry is None:
+			response.status_code = 404
+			response.reason = "Not in archive"
+			response._content = b""
+			return response
+
+		response.status_code = entry["status"]
+		response.reason = "Replayed"
+		response.headers = CaseInsensitiveDict(entry["headers"])
+		response._content = _body(entry)
+		return response
+
+	def close(self) -> None:
+		pass
+
+def record(session: requests.Session, archive: Archive, stream: str) -> None:
+	adapter = RecordingAdapter(archive, stream)
+	session.mount("http://", adapter)
+	session.mount("https://", adapter)
+
+def replay(session: requests.Session, archive: Archive, stream: str, clock: SimulatedClock) -> None:
+	adapter = ReplayAdapter(archive, stream, clock)
+	session.mount("http://", adapter)
+	session.mount("https://", adapter)
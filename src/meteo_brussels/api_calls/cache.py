@@ -0,0 +1,65 @@
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+@dataclass(frozen=True)
+class CachedResponse:
+	fetched_at: float
+	"""Unix time the payload was received"""
+	payload: bytes
+
+	def age(self) -> float:
+		return time.time() - self.fetched_at
+
+class ResponseCache():
+	"""
+	Keeps the last good raw response per name on disk, so the next launch can paint something right away.
+
+	Each entry is one file: the receive time on the first line, the payload after it.
+	Files are written to a temporary name and renamed over the old one, so a crash leaves either the old or the new entry
+	"""
+	log = logging.getLogger("ResponseCache")
+
+	def __init__(self, directory: Path, ttl: float = 6 * 60 * 60) -> None:
+		self.directory = directory
+		self.ttl = ttl
+
+	def _path(self, name: str) -> Path:
+		return self.directory / f"{name}.cache"
+
+	def load(self, name: str) -> CachedResponse | None:
+		try:
+			raw = self._path(name).read_bytes()
+			header, payload = raw.split(b"\n", 1)
+			entry = CachedResponse(float(header), payload)
+		except FileNotFoundError:
+			return None
+		except (OSError, ValueError) as e:
+			self.log.warning(f"Ignoring unreadable cache entry {name}: {e}")
+			return None
+
+		if entry.age() > self.ttl:
+			self.log.info(f"Cache entry {name} expired")
+			return None
+		return entry
+
+	def store(self, name: str, payload: bytes, fetched_at: float | None = None) -> None:
+		stamp = fetched_at if fetched_at is not None else time.time()
+		try:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+			try:
+				with os.fdopen(fd, "wb") as f:
+					f.write(f"{stamp}\n".encode())
+					f.write(payload)
+					f.flush()
+					os.fsync(f.fileno())
+				os.replace(tmp, self._path(name))
+			except BaseException:
+				os.unlink(tmp)
+				raise
+		except OSError as e:
+			self.log.warning(f"Could not write cache entry {name}: {e}")
@@ -0,0 +1,229 @@
+import time
+from collections import deque
+from statistics import fmean
+
+class PublicationCadence():
+	"""
+	Learns how often BATC publishes a new timepoint, from when currentLabel is seen to advance,
+	and suggests when to poll next: once per expected publication, shortly after it,
+	retrying when an expected update doesn't show up.
+
+	A publication is only known to lie between the last poll that returned the old label and the first one with the new label.
+	Every publication gets one poll at a target time. When that poll already sees the new label, the next target moves a little earlier.
+	When it doesn't, the next target moves later. So the target settles just after nearly all publications, however late they tend to be.
+
+	One poll is granted every default_period, so on average we never poll more often than the fixed timer did.
+	Moving the target earlier costs a bit of that, and a retry may borrow the poll of the next publication.
+	Either is paid back by skipping a publication when needed
+	"""
+	def __init__(self, default_period: float = 120.0, poll_delay: float = 10.0, max_backoff: float = 600.0, history: int = 10, burst: float = 2.0) -> None:
+		self.default_period = default_period
+		"""Also the budget, on average never more than one poll per default_period"""
+		self.burst = burst
+		"""Polls that can be saved up while publications are further apart than default_period"""
+		self.poll_delay = poll_delay
+		"""How long to wait before retrying a publication that didn't show up yet"""
+		self.max_backoff = max_backoff
+
+		self._intervals: deque[tuple[float, int]] = deque(maxlen=history)
+		"""Between publications we know to within poll_delay, and the number of periods in between"""
+		self._rough_intervals: deque[float] = deque(maxlen=history)
+		"""Between publications seen by the fixed polls before the first target, only used to plan until there are precise ones.
+		Once polls are planned, every one of them sees a new label and these would only measure our own planning"""
+		self._rough_count = 0
+		"""Rough intervals since we last started planning from them"""
+		self._rejected = 0
+		"""Precise intervals in a row that didn't agree with the planning period"""
+		self._advances = 0
+		"""Publications since the last precise one: times the label advanced, and targets we skipped"""
+		self._label: str | None = None
+		self._last_seen: float | None = None
+		"""Last poll that still returned the current label"""
+		self._published_at: float | None = None
+		"""Best guess of when the current label was published, None until we saw it change once"""
+		self._precise_at: float | None = None
+		"""The last publication we know to within poll_delay"""
+		self._target: float | None = None
+		"""When to poll for the next publication, None until we have an idea of the period"""
+		self._next: float | None = None
+		"""When to poll next, the target or a retry"""
+		self._step = poll_delay / 2
+		"""How much earlier the target moves when it saw a new label"""
+		self._converging = True
+		"""The step doubles every time until a target first comes too early, to find the publications quickly"""
+		self._misses = 0
+		"""Polls at or after the target that didn't see a new label"""
+		self._credit = 0.0
+		"""Polls we can still afford"""
+		self._granted: float | None = None
+		"""Credit has been added up to here"""
+		self._skipped = False
+		"""The target before this one was skipped, so it will see two publications"""
+
+	def observe(self, label: str, now: float | None = None) -> bool:
+		"""Feed the label of every successful poll, returns True if it advanced"""
+		now = now if now is not None else time.time()
+		if self._target is not None:
+			self._credit -= 1.0
+		if label == self._label:
+			self._last_seen = now
+			self._missed(now, failed=False)
+			return False
+
+		since = self._last_seen
+		if self._label is not None and since is not None:
+			self._bracket(since, now)
+		self._label = label
+		self._last_seen = now
+
+		period = self.planning_period()
+		if period is None or (self._target is None and self._rough_count < 2):
+			self._next = now + self.default_period
+		elif self._target is None or self._misses > 2:
+			# Lost track of the publications, find them again, starting from the one we are sure already happened
+			(self._step, self._converging) = (self.poll_delay / 2, True)
+			if self._granted is None:
+				(self._credit, self._granted) = (0.0, now)
+			self._plan(now + period, period, now)
+		elif self._misses and since is not None and now - since <= 2 * self.poll_delay:
+			# The target came too early, the publication was just before now
+			(self._step, self._converging) = (self.poll_delay / 20, False)
+			self._plan(now + period, period, now)
+		else:
+			if self._skipped:
+				# Saw two publications, that doesn't tell how early the target could be
+				self._plan(min(self._target, now) + period, period, now)
+			else:
+				safe = min(self._target, now) + period
+				self._plan(safe - self._step, period, now, safe)
+				if not self._skipped:
+					self._step = min((2 if self._converging else 1.1) * self._step, period / 4)
+		self._misses = 0
+		return True
+
+	def observe_failure(self, now: float | None = None) -> None:
+		now = now if now is not None else time.time()
+		if self._target is not None:
+			self._credit -= 1.0
+		self._missed(now, failed=True)
+
+	def _missed(self, now: float, failed: bool) -> None:
+		"""A poll that didn't see a new label"""
+		if self._target is None:
+			if failed:
+				self._misses += 1
+			self._next = now + self.default_period * 2 ** min(self._misses, 2)
+			return
+		if now < self._target:
+			# Not one we planned, keep to the plan
+			return
+
+		self._misses += 1
+		if self._credit >= 0.0:
+			# Late, or the cadence changed. Retry slower and slower
+			self._next = now + min(self.poll_delay * 2 ** (self._misses - 1), self.max_backoff)
+			return
+
+		# No polls left for this publication, the next target will see it
+		period = self.planning_period() or self.default_period
+		later = self._step if self._converging else self.poll_delay
+		(self._step, self._converging) = (self.poll_delay / 20, False)
+		self._plan(self._target + period + later, period, now)
+
+	def _plan(self, target: float, period: float, now: float, safe: float | None = None) -> None:
+		"""
+		Poll for the next publication at `target`. If we can't afford that, skip a publication instead.
+		Skipped from `safe`, a time known to be late enough: a skip makes the next poll see a new label wherever it lands,
+		that would hide a target that came too early
+		"""
+		self._skipped = False
+		if target <= now or self._credit_at(target) < 1.0:
+			target = safe if safe is not None else target
+			while target <= now or not self._skipped or self._credit_at(target) < 1.0:
+				(target, self._skipped) = (target + period, True)
+				self._advances += 1
+		self._credit = self._credit_at(target)
+		self._target = self._next = self._granted = target
+
+	def _credit_at(self, when: float) -> float:
+		"""One more poll every default_period, granted up to the next target"""
+		if self._granted is None:
+			return self._credit
+		return min(self._credit, self.burst) + (when - self._granted) / self.default_period
+
+	def _bracket(self, since: float, now: float) -> None:
+		"""The label changed between the poll at `since` and now"""
+		uncertainty = (now - since) / 2
+		published = since + uncertainty
+		guess = self.planning_period()
+
+		self._advances += 1
+		if uncertainty <= self.poll_delay:
+			if self._precise_at is not None and guess is not None:
+				# Only when counting agrees with span / guess. A guess that is a bit off can't tell 26 from 27 periods,
+				# and when publications come right around the target, one more or less may have slipped in
+				span = published - self._precise_at
+				if round(span / guess) == self._advances:
+					self._intervals.append((span, self._advances))
+					self._rejected = 0
+				else:
+					self._rejected += 1
+			(self._precise_at, self._advances) = (published, 0)
+		elif (expected := self.expected()) is not None and since < expected <= now:
+			# Sharper than this poll can tell, only used for the data age
+			published = expected
+
+		if self._published_at is not None and self._target is None:
+			self._rough_intervals.append(published - self._published_at)
+			self._rough_count += 1
+		self._published_at = published
+
+		if self._rejected >= 3:
+			# Planned with the wrong period, then the counts are off too. Back to the fixed polls, for a better mean of the rough intervals
+			self._intervals.clear()
+			(self._target, self._granted, self._precise_at, self._advances) = (None, None, None, 0)
+			(self._rough_count, self._rejected) = (0, 0)
+
+	def period(self) -> float | None:
+		"""Measured time between publications, None until we pinned down two of them"""
+		if not self._intervals:
+			return None
+		# Median of the periods, weighted by how many each interval spans: the error of a single one is spread over all of them
+		periods = sorted((span / count, count) for (span, count) in self._intervals)
+		half = sum(count for (_, count) in periods) / 2
+		for (period, count) in periods:
+			half -= count
+			if half <= 0:
+				return period
+		return periods[-1][0]
+
+	def planning_period(self) -> float | None:
+		"""The period polls are planned with, None until we have any idea"""
+		if self.is_provisional():
+			# Each rough interval is off by up to default_period, their mean by much less
+			return fmean(self._rough_intervals)
+		return self.period()
+
+	def is_provisional(self) -> bool:
+		"""True while planning_period() comes from the rough intervals, too few precise ones yet"""
+		return bool(self._rough_intervals) and sum(count for (_, count) in self._intervals) < 4
+
+	def expected(self) -> float | None:
+		period = self.planning_period()
+		if period is None or self._published_at is None:
+			return None
+		return self._published_at + period
+
+	def data_age(self, now: float | None = None) -> float | None:
+		"""Seconds since the current label was published, as far as we can tell"""
+		if self._published_at is None:
+			return None
+		now = now if now is not None else time.time()
+		return now - self._published_at
+
+	def next_poll(self, now: float | None = None) -> float:
+		"""Seconds from now until the next poll is worth doing"""
+		if self._next is None:
+			return self.default_period
+		now = now if now is not None else time.time()
+		return max(0.0, self._next - now)
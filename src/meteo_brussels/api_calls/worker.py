@@ -0,0 +1,77 @@
+import logging
+from typing import Any, Callable
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _JobSignals(QObject):
+	finished = Signal(object)
+	failed = Signal(str)
+
+
+class _Job(QRunnable):
+	def __init__(self, fn: Callable[[], Any], signals: _JobSignals) -> None:
+		super().__init__()
+		self._fn = fn
+		self._signals = signals
+
+	def run(self) -> None:
+		try:
+			result = self._fn()
+		except Exception as e:
+			self._signals.failed.emit(f"{type(e).__name__}: {e}")
+			return
+		self._signals.finished.emit(result)
+
+
+class SingleFlightWorker(QObject):
+	"""
+	Runs a blocking job on a thread pool, at most one at a time.
+
+	Results come back through Qt signals, so slots connected from the GUI thread
+	run on the GUI thread. Calling start() while a job is in flight does not queue
+	a second one, the caller simply gets the result of the running job.
+	"""
+	started = Signal()
+	finished = Signal(object)
+	failed = Signal(str)
+
+	log = logging.getLogger("SingleFlightWorker")
+
+	last_result: Any = None
+	completed: int = 0
+	"""Number of jobs that finished, so late subscribers can pick up a result they missed"""
+
+	def __init__(self, job: Callable[[], Any], pool: QThreadPool | None = None) -> None:
+		super().__init__()
+		self._job = job
+		self._pool = pool or QThreadPool.globalInstance()
+		self._running = False
+
+		self._signals = _JobSignals()
+		self._signals.finished.connect(self._on_finished)
+		self._signals.failed.connect(self._on_failed)
+
+	def is_running(self) -> bool:
+		return self._running
+
+	def start(self) -> bool:
+		"""Returns False if a job was already in flight and we joined it instead"""
+		if self._running:
+			return False
+
+		self._running = True
+		self.started.emit()
+		runnable = _Job(self._job, self._signals)
+		self._pool.start(runnable)
+		return True
+
+	def _on_finished(self, result: Any) -> None:
+		self._running = False
+		self.last_result = result
+		self.completed += 1
+		self.finished.emit(result)
+
+	def _on_failed(self, message: str) -> None:
+		self._running = False
+		self.log.warning(f"Background job failed: {message}")
+		self.failed.emit(message)
@@ -0,0 +1,110 @@
+import logging
+import time
+import numpy as np
+
+from sensor_types import ReadingRecord
+
+COLUMNS = (
+	"wind_speed",
+	"wind_direction",
+	"wind_direction_deviation_left",
+	"wind_direction_deviation_right",
+	"wind_gust",
+	"tail_wind",
+	"cross_wind",
+)
+_COLUMN = {name: idx for (idx, name) in enumerate(COLUMNS)}
+
+
+class WindHistory():
+	"""
+	The last `capacity` readings of every sensor, as NumPy columns in ring buffers, with one timestamp column shared by all sensors.
+
+	Every sample is written twice, at i and i + capacity, so the newest `capacity` samples are always
+	one contiguous stretch of the buffer. Appending is O(1) and window queries return views, never copies.
+	A sensor missing from a reading, and tail/cross wind of plain anemometers, are NaN.
+	"""
+	log = logging.getLogger("WindHistory")
+
+	def __init__(self, capacity: int = 720) -> None:
+		"""The default holds a day of BATC's 2 minute readings"""
+		self.capacity = capacity
+		self._times = np.full(2 * capacity, np.nan)
+		self._sensors: dict[str, np.ndarray] = {}
+		"""Sensor key to a (len(COLUMNS), 2 * capacity) float32 array"""
+		self._next = 0
+		self._count = 0
+
+	def __len__(self) -> int:
+		return self._count
+
+	def keys(self) -> list[str]:
+		return list(self._sensors)
+
+	def latest_time(self) -> float | None:
+		if self._count == 0:
+			return None
+		return float(self._times[self._next + self.capacity - 1])
+
+	def append(self, reading: ReadingRecord, at: float | None = None) -> bool:
+		"""
+		Adds one sample for every sensor, at the reading's own time unless given.
+		Returns False if it is not newer than the last sample, e.g. the same reading again
+		"""
+		at = float(at if at is not None else reading.meteo_date)
+		latest = self.latest_time()
+		if latest is not None and at <= latest:
+			return False
+
+		slots = [self._next, self._next + self.capacity]
+		self._times[slots] = at
+
+		for key in reading.wind_sensor_detail.keys() - self._sensors.keys():
+			self._sensors[key] = np.full((len(COLUMNS), 2 * self.capacity), np.nan, dtype=np.float32)
+
+		for (key, columns) in self._sensors.items():
+			sensor = reading.wind_sensor_detail.get(key)
+			if sensor is None:
+				columns[:, slots] = np.nan
+				continue
+
+			wind = sensor.sensor_reading
+			tail_cross = sensor.sensor_wind
+			values = (
+				wind.wind_speed,
+				wind.wind_direction,
+				wind.wind_direction_deviation_left,
+				wind.wind_direction_deviation_right,
+				wind.wind_gust,
+				tail_cross.tail_wind if tail_cross else np.nan,
+				tail_cross.cross_wind if tail_cross else np.nan,
+			)
+			columns[:, slots] = np.array(values, dtype=np.float32)[:, np.newaxis]
+
+		self._next = (self._next + 1) % self.capacity
+		self._count = min(self._count + 1, self.capacity)
+		return True
+
+	def _window(self, since: float | None) -> slice:
+		end = self._next + self.capacity
+		start = end - self._count
+		if since is not None:
+			start += int(np.searchsorted(self._times[start:end], since, side="left"))
+		return slice(start, end)
+
+	def times(self, since: float | None = None) -> np.ndarray:
+		return self._times[self._window(since)]
+
+	def sensor(self, key: str, since: float | None = None) -> np.ndarray:
+		"""All columns of one sensor, oldest first, shaped (len(COLUMNS), samples). Index rows with COLUMNS"""
+		return self._sensors[key][:, self._window(since)]
+
+	def column(self, key: str, name: str, since: float | None = None) -> np.ndarray:
+		return self._sensors[key][_COLUMN[name], self._window(since)]
+
+	def last(self, key: str, seconds: float, now: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+		"""Timestamps and columns of the last `seconds`, counted back from now or the newest sample if now is not given"""
+		if now is None:
+			now = self.latest_time() or time.time()
+		window = self._window(now - seconds)
+		return self._times[window], self._sensors[key][:, window]
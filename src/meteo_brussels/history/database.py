@@ -0,0 +1,164 @@
+import logging
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from sensor_types import ReadingRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sensor (
+	id INTEGER PRIMARY KEY,
+	key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sample (
+	sensor_id INTEGER NOT NULL REFERENCES sensor(id),
+	time INTEGER NOT NULL,
+	wind_speed INTEGER,
+	wind_direction INTEGER,
+	wind_direction_deviation_left INTEGER,
+	wind_direction_deviation_right INTEGER,
+	wind_gust INTEGER,
+	tail_wind REAL,
+	cross_wind REAL,
+	PRIMARY KEY (sensor_id, time)
+) WITHOUT ROWID;
+"""
+"""The primary key is the (sensor, time) index, and without a rowid the rows are stored in that order"""
+
+_INSERT = "INSERT OR IGNORE INTO sample VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+_FLUSH = object()
+_STOP = object()
+
+class Sample(NamedTuple):
+	time: int
+	wind_speed: int
+	wind_direction: int
+	wind_direction_deviation_left: int
+	wind_direction_deviation_right: int
+	wind_gust: int
+	tail_wind: float | None
+	cross_wind: float | None
+
+def _connect(path: Path) -> sqlite3.Connection:
+	connection = sqlite3.connect(path)
+	connection.execute("PRAGMA journal_mode=WAL")
+	# With WAL this can only lose the last transactions on power loss, never corrupt
+	connection.execute("PRAGMA synchronous=NORMAL")
+	return connection
+
+class HistoryDatabase():
+	"""
+	Every reading, for every sensor, in SQLite so it survives restarts.
+
+	write() only queues the reading. A writer thread inserts whatever is queued in one transaction,
+	once batch_size readings are waiting or flush_interval seconds passed. Queries open their own connection
+	and stream rows, WAL lets them run while the writer is busy.
+	"""
+	log = logging.getLogger("HistoryDatabase")
+
+	def __init__(self, path: Path, batch_size: int = 50, flush_interval: float = 5.0) -> None:
+		self.path = path
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+
+		path.parent.mkdir(parents=True, exist_ok=True)
+		with _connect(path) as connection:
+			connection.executescript(_SCHEMA)
+		connection.close()
+
+		self._queue: queue.Queue[tuple[ReadingRecord, int] | object] = queue.Queue()
+		self._thread = threading.Thread(target=self._run, name="HistoryDatabase", daemon=True)
+		self._thread.start()
+
+	def write(self, reading: ReadingRecord, at: int | None = None) -> None:
+		"""Returns right away, the insert happens on the writer thread"""
+		self._queue.put((reading, at if at is not None else reading.meteo_date))
+
+	def flush(self) -> None:
+		"""Blocks until everything written so far is committed"""
+		self._queue.put(_FLUSH)
+		self._queue.join()
+
+	def close(self) -> None:
+		self._queue.put(_STOP)
+		self._thread.join()
+
+	def _run(self) -> None:
+		connection = _connect(self.path)
+		sensor_ids: dict[str, int] = {}
+		running = True
+		while running:
+			batch = [self._queue.get()]
+			# Gather more, up to the batch size or until the queue stays empty for flush_interval
+			while batch[-1] is not _FLUSH and batch[-1] is not _STOP and len(batch) < self.batch_size:
+				try:
+					batch.append(self._queue.get(timeout=self.flush_interval))
+				except queue.Empty:
+					break
+
+			running = batch[-1] is not _STOP
+			try:
+				self._insert(connection, sensor_ids, [item for item in batch if isinstance(item, tuple)])
+			except sqlite3.Error:
+				self.log.exception(f"Could not write {len(batch)} readings")
+			finally:
+				for _ in batch:
+					self._queue.task_done()
+		connection.close()
+
+	def _insert(self, connection: sqlite3.Connection, sensor_ids: dict[str, int], batch: list[tuple[ReadingRecord, int]]) -> None:
+		if not batch:
+			return
+
+		rows = []
+		with connection:
+			for (reading, at) in batch:
+				for (key, sensor) in reading.wind_sensor_detail.items():
+					if key not in sensor_ids:
+						connection.execute("INSERT OR IGNORE INTO sensor (key) VALUES (?)", (key,))
+						sensor_ids[key] = connection.execute("SELECT id FROM sensor WHERE key = ?", (key,)).fetchone()[0]
+
+					wind = sensor.sensor_reading
+					tail_cross = sensor.sensor_wind
+					rows.append((
+						sensor_ids[key],
+						at,
+						wind.wind_speed,
+						wind.wind_direction,
+						wind.wind_direction_deviation_left,
+						wind.wind_direction_deviation_right,
+						wind.wind_gust,
+						tail_cross.tail_wind if tail_cross else None,
+						tail_cross.cross_wind if tail_cross else None,
+					))
+			connection.executemany(_INSERT, rows)
+		self.log.debug(f"Wrote {len(batch)} readings, {len(rows)} rows")
+
+	def sensors(self) -> list[str]:
+		with sqlite3.connect(self.path) as connection:
+			rows = connection.execute("SELECT key FROM sensor ORDER BY key").fetchall()
+		connection.close()
+		return [key for (key,) in rows]
+
+	def samples(self, key: str, start: int | None = None, end: int | None = None) -> Iterator[Sample]:
+		"""Samples of one sensor with start <= time < end, oldest first, read lazily"""
+		connection = sqlite3.connect(self.path)
+		try:
+			cursor = connection.execute(
+				"""
+				SELECT time, wind_speed, wind_direction, wind_direction_deviation_left, wind_direction_deviation_right,
+					wind_gust, tail_wind, cross_wind
+				FROM sample JOIN sensor ON sensor.id = sample.sensor_id
+				WHERE sensor.key = ? AND time >= ? AND time < ?
+				ORDER BY time
+				""",
+				(key, start if start is not None else -2**63, end if end is not None else 2**63 - 1),
+			)
+			while rows := cursor.fetchmany(1000):
+				for row in rows:
+					yield Sample._make(row)
+		finally:
+			connection.close()
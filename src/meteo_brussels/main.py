@@ -1,36 +1,87 @@
+import time
+_PROCESS_START = time.perf_counter()
+
+import argparse
 import logging
+import sys
+from pathlib import Path
 
-from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QApplication, QSplashScreen
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QApplication, QSplashScreen, QDockWidget, QLabel
+from PySide6.QtCore import Qt, QStandardPaths, Signal
 from PySide6.QtGui import QKeySequence, QIcon, QPixmap
 
-from sensor_types import Reading
-from api_calls import BatcAPI
+from sensor_types import ReadingRecord
+from api_calls import BatcAPI, MetarAPI, FetchResult, BATC_BASE_URL, METAR_BASE_URL
+from api_calls.worker import SingleFlightWorker
+from api_calls.cache import ResponseCache
+from api_calls.cadence import PublicationCadence
+from api_calls import archive
+from scheduler import Scheduler
+from store import ReadingStore
+from history import WindHistory
+from history.database import HistoryDatabase
+from startup import StartupOrchestrator
 from widgets import make_color_scheme_menu
 from widgets.wind_grid import WindGrid
 from widgets.wind_rose.selectable import SelectableWindRose
 from widgets.many_wind_roses import ManyWindRoses
 from widgets.wind_rose.popout import PopOutRose
 from widgets.weather_data import WeatherData
+from widgets.scheduler_debug import SchedulerDebug
+from widgets.runway_advisor import RunwayAdvisor
 from resources import resources
 
 log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 class MainWindow(QMainWindow):
-    api = BatcAPI()
-    data: Reading  | None = None
+    api: BatcAPI
+    data: ReadingRecord | None = None
 
-    refresh_interval = 2 * 60 * 1000 # 2 minutes
+    refresh_interval = 2 * 60 # 2 minutes
     auto_refresh = False
     show_debug = False
 
-    _popped_out: dict[str, PopOutRose] = {}
+    has_fresh_data = False
+
+    first_data_shown = Signal()
 
-    def __init__(self):
+    def __init__(
+        self,
+        api: BatcAPI | None = None,
+        metar_api: MetarAPI | None = None,
+        speed: float = 1.0,
+        cache: ResponseCache | None = None,
+        fetcher: SingleFlightWorker | None = None,
+        metar_worker: SingleFlightWorker | None = None,
+        database: HistoryDatabase | None = None,
+    ):
         super().__init__()
 
-        self.api.setup_cookies()
+        self.api = api or BatcAPI()
+        self._popped_out: dict[str, PopOutRose] = {}
+
+        self.scheduler = Scheduler(speed)
+        self.cadence = PublicationCadence(default_period=self.refresh_interval / speed, poll_delay=10 / speed, max_backoff=600 / speed)
+
+        self.cache = cache
+        self.api.cache = self.cache
+
+        # Widgets subscribe to this, and only redraw the sensors that changed
+        self.store = ReadingStore()
+        self.history = WindHistory()
+        self.store.reading_changed.connect(lambda: self.history.append(self.store.reading))
+        self.database = database
+        if database:
+            self.store.reading_changed.connect(lambda: database.write(self.store.reading))
+
+        # Cookie setup happens on the first fetch, in the background. It may already be running
+        self.fetcher = fetcher or SingleFlightWorker(self.api.fetch_latest)
+        self.fetcher.started.connect(lambda: self.status.showMessage("Refreshing..."))
+        self.fetcher.finished.connect(self._on_fetched)
+        self.fetcher.failed.connect(self._on_fetch_failed)
+        self.fetcher.finished.connect(lambda _: self.scheduler.job_done("batc"))
+        self.fetcher.failed.connect(lambda _: self.scheduler.job_done("batc"))
 
         self.setWindowTitle("vBARWIS")
         icon = QIcon(":/sock.png")
@@ -62,83 +113,133 @@ class MainWindow(QMainWindow):
 
         layout = QHBoxLayout(container)
 
-        self._weather_data = WeatherData()
+        self._weather_data = WeatherData(self.scheduler, api=metar_api, cache=self.cache, worker=metar_worker)
         layout.addWidget(self._weather_data, stretch=1)
 
         central_container = QWidget()
         central_layout = QVBoxLayout(central_container)
         layout.addWidget(central_container, stretch=1)
 
-        self.wind_grid = WindGrid()
+        self.wind_grid = WindGrid(self.store, self.history)
         central_layout.addWidget(self.wind_grid, stretch=0)
 
         self.status = self.statusBar()
         self.status.showMessage("Done")
+        self.cadence_label = QLabel()
+        self.status.addPermanentWidget(self.cadence_label)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.on_timer)
-        if self.auto_refresh:
-            self.timer.start(self.refresh_interval)
+        self.scheduler.add("batc", self.refresh_interval, self.get_data, jitter=15, enabled=self.auto_refresh, asynchronous=True)
+        self.scheduler.add("data-age", 10, self._show_cadence, align=True, owner=self, wall_clock=True)
+
+        self.scheduler_debug = QDockWidget("Scheduler")
+        self.scheduler_debug.setWidget(SchedulerDebug(self.scheduler))
+        self.scheduler_debug.setVisible(self.show_debug)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.scheduler_debug)
+
+        self.runway_advisor = QDockWidget("Runway configurations")
+        self.runway_advisor.setWidget(RunwayAdvisor(self.store))
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.runway_advisor)
+        self.refreshMenu.addAction(self.runway_advisor.toggleViewAction())
 
-        self.wind_rose = SelectableWindRose(show_debug_lines=self.show_debug)
+        self.wind_rose = SelectableWindRose(self.store, show_debug_lines=self.show_debug)
         self.wind_rose.popped_out.connect(self.pop_out)
         central_layout.addWidget(self.wind_rose, stretch=1)
 
-        self.many_wind_roses = ManyWindRoses()
+        self.many_wind_roses = ManyWindRoses(self.store)
         self.many_wind_roses.popped_out.connect(self.pop_out)
         layout.addWidget(self.many_wind_roses)
 
-        self.get_data(initial=True)
-    
-    def get_data(self, initial: bool = False):
-        self.status.showMessage("Refreshing...")
-        data = self.api.fetch_doc()
-        if data is None:
+        # Paint whatever we had last time while the fresh data loads
+        if self.fetcher.completed == 0 and (cached := self.api.load_cached()):
+            self._on_fetched(cached)
+
+        if self.fetcher.completed:
+            # The startup fetch finished while the widgets were being built
+            self._on_fetched(self.fetcher.last_result)
+        elif self.fetcher.is_running():
+            self.status.showMessage("Refreshing...")
+        else:
+            self.get_data()
+
+    def get_data(self) -> None:
+        """Starts a background fetch, or joins the one already in flight"""
+        if not self.fetcher.start():
+            self.status.showMessage("Refresh already in progress...")
+
+    def _on_fetched(self, result: FetchResult | None) -> None:
+        if result is None:
             self.status.showMessage("Got no data..")
+            self._learn_cadence(None)
             return
 
-        current = data.currentLabel
-        self.data = self.api.get_latest_reading(data)
+        if result.fetched_at is None:
+            self._learn_cadence(result.label)
 
-        if self.data is None:
-            self.status.showMessage("No data after parse...")
+        if not result.changed and self.data is not None:
+            # Same document as before, the widgets already show it. Possibly read from the cache, but now confirmed
+            self.status.showMessage(f"No change, data from {result.label}")
+            self._fresh_data_shown()
             return
 
-        # Loading to children
-        self.wind_grid.load_data(self.data)
-        self.wind_rose.set_data(self.data)
-        self.many_wind_roses.set_reading(self.data)
-        
+        initial = self.data is None
+        current = result.label
+        self.data = result.reading
+
+        # The store tells the children what changed
+        self.store.set_reading(self.data)
+
         if initial:
             self.wind_rose.selected.connect(self.update_many_keys)
-            keys = [key for key in self.data.wind_sensor_detail.keys() if "runway-" in key]
-            keys.pop(0)
-            self.many_wind_roses.set_show_keys(keys)
-
-        for (_key, popout) in self._popped_out.items():
-            popout.set_data_from(self.data)
+            self.many_wind_roses.set_show_keys(list(self.data.runway_index.runway_keys[1:]))
 
         log.info(f"Got {len(self.data.wind_sensor_detail)}")
-        self.status.showMessage(f"Done, data from {current}")
+        if result.fetched_at is not None:
+            age = (time.time() - result.fetched_at) / 60
+            self.status.showMessage(f"STALE: cached data from {current}, {age:.0f} min old. Refreshing...")
+        else:
+            self.status.showMessage(f"Done, data from {current}")
+            self._fresh_data_shown()
+
+    def _fresh_data_shown(self) -> None:
+        if not self.has_fresh_data:
+            self.has_fresh_data = True
+            self.first_data_shown.emit()
+
+    def _on_fetch_failed(self, message: str) -> None:
+        self.status.showMessage(f"Refresh failed: {message}")
+        self._learn_cadence(None)
+
+    def _learn_cadence(self, label: str | None) -> None:
+        if label is None:
+            self.cadence.observe_failure()
+        else:
+            self.cadence.observe(label)
+
+        if self.auto_refresh:
+            self.scheduler.reschedule("batc", self.cadence.next_poll())
+        self._show_cadence()
+
+    def _show_cadence(self) -> None:
+        period = self.cadence.planning_period()
+        age = self.cadence.data_age()
+        if period is None:
+            text = "Learning publication period"
+        else:
+            text = f"Published every {period / 60:.1f} min" + (" (provisional)" if self.cadence.is_provisional() else "")
+        if age is not None:
+            text += f", data age {age / 60:.1f} min"
+        self.cadence_label.setText(text)
 
     def update_many_keys(self, selected_key: str) -> None:
         if self.data is None:
             return
 
-        keys = [key for key in self.data.wind_sensor_detail.keys() if "runway-" in key]
-        keys.remove(selected_key)
+        keys = [key for key in self.data.runway_index.runway_keys if key != selected_key]
         self.many_wind_roses.set_show_keys(keys)
 
-    def on_timer(self):
-        self.get_data()
-
     def toggle_autorefresh(self):
-        if self.auto_refresh:
-            self.timer.stop()
-        else:
-            self.timer.start(self.refresh_interval)
-
         self.auto_refresh = not self.auto_refresh
+        self.scheduler.set_enabled("batc", self.auto_refresh)
         self.auto_refresh_action.setChecked(self.auto_refresh)
     
     def toggle_debug(self):
@@ -146,6 +247,7 @@ class MainWindow(QMainWindow):
         self.debug_toggle.setChecked(self.show_debug)
 
         self.wind_rose.set_debug(self.show_debug)
+        self.scheduler_debug.setVisible(self.show_debug)
 
     def pop_out(self, key: str) -> None:
         if self.data is None:
@@ -157,7 +259,7 @@ class MainWindow(QMainWindow):
             return
 
         print(f"Popping out {key}")
-        popout = PopOutRose(key, self.data.wind_sensor_detail[key].sensor_reading)
+        popout = PopOutRose(key, self.data.wind_sensor_detail[key].sensor_reading, self.store)
         self._popped_out[key] = popout
         popout.about_to_close.connect(lambda: self._popped_out.pop(key, None))
         popout.show()
@@ -167,15 +269,74 @@ class MainWindow(QMainWindow):
         QApplication.styleHints().setColorScheme(scheme)
 
 
+def _speed(value: str) -> float:
+    speed = float(value.lower().removesuffix("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
 def main():
-    app = QApplication()
+    parser = argparse.ArgumentParser(prog="vBARWIS")
+    parser.add_argument("--batc-url", default=BATC_BASE_URL, help="Base URL of the BATC site, e.g. a local stand-in server")
+    parser.add_argument("--metar-url", default=METAR_BASE_URL, help="Base URL of the METAR service")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", type=Path, metavar="DIR", help="Append every raw BATC and METAR response to an archive in DIR")
+    mode.add_argument("--replay", type=Path, metavar="DIR", help="Serve the responses archived in DIR instead of going to the network")
+    parser.add_argument("--speed", type=_speed, default=1.0, help="How much faster than real time to replay, e.g. 60x")
+    parser.add_argument("--startup-metrics", type=Path, metavar="FILE", help="Append startup timings as a JSON line to FILE")
+    args, qt_args = parser.parse_known_args()
+    if args.speed != 1.0 and not args.replay:
+        parser.error("--speed only applies to --replay")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setApplicationName("vBARWIS")
+
+    batc_api = BatcAPI(args.batc_url)
+    metar_api = MetarAPI(args.metar_url)
+    speed = 1.0
+    cache = None
+    if args.record:
+        responses = archive.Archive(args.record)
+        archive.record(batc_api.session, responses, "batc")
+        archive.record(metar_api.session, responses, "metar")
+    elif args.replay:
+        responses = archive.Archive(args.replay)
+        responses.load()
+        clock = archive.SimulatedClock(responses.start_time() or time.time(), args.speed)
+        archive.replay(batc_api.session, responses, "batc", clock)
+        archive.replay(metar_api.session, responses, "metar", clock)
+        speed = args.speed
+
+    # A replay must not end up in the cache of the next real launch
+    if not args.replay:
+        cache = ResponseCache(Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)))
+        batc_api.cache = cache
+        metar_api.cache = cache
+
+    # Get the network going first, everything below overlaps with it
+    startup = StartupOrchestrator(batc_api, metar_api, _PROCESS_START, args.startup_metrics)
+    startup.start()
+
+    database = None
+    if not args.replay:
+        database = HistoryDatabase(Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)) / "history.sqlite3")
+        app.aboutToQuit.connect(database.close)
 
     img = QPixmap(":/sock.png")
     splash = QSplashScreen(img)
+    startup.progress.connect(lambda msg: splash.showMessage(msg, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter))
     splash.show()
+    splash.showMessage("Building wind displays...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter)
     app.processEvents()
 
-    window = MainWindow()
+    window = MainWindow(batc_api, metar_api, speed=speed, cache=cache, fetcher=startup.batc_fetcher, metar_worker=startup.metar_worker, database=database)
+    startup.window_built()
+    window.first_data_shown.connect(startup.first_data_shown)
+    if window.has_fresh_data:
+        startup.first_data_shown()
+    if args.replay and not window.auto_refresh:
+        window.toggle_autorefresh()
+
     window.show()
     splash.finish(window)
 
@@ -0,0 +1,53 @@
+import numpy as np
+
+EBBR_HEADINGS = {
+	"01": 14.0,
+	"19": 194.0,
+	"07L": 64.0,
+	"07R": 64.0,
+	"25L": 244.0,
+	"25R": 244.0,
+}
+"""Approximate magnetic heading of each EBBR runway end, in degrees"""
+
+
+def heading(name: str) -> float | None:
+	return EBBR_HEADINGS.get(name.upper())
+
+
+def headings(names: tuple[str, ...] | list[str]) -> np.ndarray:
+	"""NaN for runways we don't know the heading of"""
+	return np.array([EBBR_HEADINGS.get(name.upper(), np.nan) for name in names])
+
+
+def sector_components(
+	runway_headings: np.ndarray,
+	directions: np.ndarray,
+	left: np.ndarray,
+	right: np.ndarray,
+	speeds: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	The worst crosswind and headwind components any wind direction from `directions - left` to `directions + right` can give,
+	at `speeds`. All arguments broadcast against each other, angles in degrees.
+
+	Returns (crosswind, headwind). Crosswind is the largest one, without side. Headwind is the lowest one,
+	negative being tailwind like BATC's tail_wind.
+
+	The extremes lie on an edge of the sector, or straight across (crosswind) or straight behind (tailwind)
+	the runway if that lies inside it. Only those five candidates are evaluated, together in one pass.
+	"""
+	runway_headings, directions, left, right, speeds = np.broadcast_arrays(runway_headings, directions, left, right, speeds)
+	lower = (directions - left)[..., np.newaxis]
+	upper = (directions + right)[..., np.newaxis]
+	runway = runway_headings[..., np.newaxis]
+
+	candidates = np.concatenate((lower, upper, runway + [90.0, -90.0, 180.0]), axis=-1)
+	# Measured clockwise from the lower edge, the edges themselves are always in
+	inside = lower + (candidates - lower) % 360.0 <= upper
+	inside[..., :2] = True
+
+	angle = np.radians(candidates - runway)
+	cross = np.where(inside, np.abs(np.sin(angle)), -np.inf).max(axis=-1) * speeds
+	head = np.where(inside, np.cos(angle), np.inf).min(axis=-1) * speeds
+	return (cross, head)
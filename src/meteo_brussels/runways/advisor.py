@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+import numpy as np
+
+from sensor_types import ReadingRecord, WindRecord
+from . import headings, sector_components
+
+CROSSWIND_LIMIT = 20.0
+TAILWIND_LIMIT = 7.0
+"""Knots, the usual limits for runway selection"""
+
+
+@dataclass(frozen=True)
+class Configuration:
+	name: str
+	arrivals: tuple[str, ...]
+	departures: tuple[str, ...]
+
+	def runways(self) -> tuple[str, ...]:
+		return tuple(dict.fromkeys(self.arrivals + self.departures))
+
+
+EBBR_CONFIGURATIONS = (
+	Configuration("25L/25R", arrivals=("25L",), departures=("25R",)),
+	Configuration("25R/25R", arrivals=("25R",), departures=("25R",)),
+	Configuration("25L+25R/25R+19", arrivals=("25L", "25R"), departures=("25R", "19")),
+	Configuration("01/07R", arrivals=("01",), departures=("07R",)),
+	Configuration("07L/07R", arrivals=("07L",), departures=("07R",)),
+	Configuration("19/19", arrivals=("19",), departures=("19",)),
+	Configuration("01/01", arrivals=("01",), departures=("01",)),
+)
+"""Arrivals/departures. The combinations EBBR commonly uses, not an official list"""
+
+
+@dataclass(frozen=True)
+class Advice:
+	configuration: Configuration
+	margin: float
+	"""Knots left to the nearest limit, negative when over it"""
+	runway: str
+	component: str
+	"""'crosswind' or 'tailwind'"""
+	value: float
+	source: str
+	"""The sensor or forecast slot that limits this configuration"""
+
+
+def advise(reading: ReadingRecord, configurations: tuple[Configuration, ...] = EBBR_CONFIGURATIONS) -> list[Advice]:
+	"""
+	Scores every configuration on its worst crosswind and tailwind, at gust speed and anywhere in the variability sector,
+	over every sensor and forecast slot that applies to its runways. Best first.
+
+	A runway sensor or forecast slot applies to its own runway, anemometers to all of them.
+	Everything is one (configuration, observation, runway) array, so this stays cheap enough to run on every refresh
+	"""
+	runways = tuple(dict.fromkeys(name for configuration in configurations for name in configuration.runways()))
+
+	observations: list[tuple[str, str | None, WindRecord]] = []
+	"""(source, runway it applies to or None for all, wind)"""
+	for (name, sensor) in reading.runways():
+		observations.append((f"sensor {name.upper()}", name.upper(), sensor.sensor_reading))
+	for key in reading.runway_index.anemometer_keys:
+		observations.append((f"sensor {key}", None, reading.wind_sensor_detail[key].sensor_reading))
+	for slot in reading.wind_forecast:
+		observations.append((f"forecast {slot.runway.upper()} {slot.time}", slot.runway.upper(), slot))
+	if not observations:
+		return []
+
+	(direction, left, right, speed, gust) = np.array([
+		(w.wind_direction, w.wind_direction_deviation_left, w.wind_direction_deviation_right, w.wind_speed, w.wind_gust)
+		for (_source, _runway, w) in observations
+	], dtype=float).T[..., np.newaxis]
+	(cross, head) = sector_components(headings(runways), direction, left, right, np.maximum(speed, gust))
+
+	cross_margin = CROSSWIND_LIMIT - cross
+	tail_margin = TAILWIND_LIMIT + head
+	margin = np.minimum(cross_margin, tail_margin)
+
+	applies = np.array([[runway is None or runway == name for name in runways] for (_source, runway, _wind) in observations])
+	uses = np.array([[name in configuration.runways() for name in runways] for configuration in configurations])
+	# (configuration, observation, runway), inf where it doesn't count
+	scored = np.where(uses[:, np.newaxis, :] & applies[np.newaxis, :, :] & ~np.isnan(margin), margin, np.inf)
+
+	flat = scored.reshape(len(configurations), -1)
+	limiting = flat.argmin(axis=1)
+	(observation_idx, runway_idx) = np.unravel_index(limiting, margin.shape)
+
+	advice = []
+	for (idx, configuration) in enumerate(configurations):
+		o, r = int(observation_idx[idx]), int(runway_idx[idx])
+		worst = float(flat[idx, limiting[idx]])
+		if worst == np.inf:
+			continue # Nothing applies, no sensors for its runways
+		is_cross = cross_margin[o, r] <= tail_margin[o, r]
+		advice.append(Advice(
+			configuration,
+			worst,
+			runways[r],
+			"crosswind" if is_cross else "tailwind",
+			float(cross[o, r]) if is_cross else float(-head[o, r]),
+			observations[o][0],
+		))
+	return sorted(advice, key=lambda a: -a.margin)
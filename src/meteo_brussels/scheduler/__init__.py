@@ -0,0 +1,189 @@
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+from PySide6.QtCore import QEvent, QObject, QTimer, Qt, Signal
+from PySide6.QtWidgets import QWidget
+
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+@dataclass
+class Job:
+	name: str
+	interval: float
+	"""Seconds between runs"""
+	callback: Callable[[], None]
+	align: bool = False
+	"""Run on multiples of interval on the wall clock, instead of interval after the last run"""
+	offset: float = 0.0
+	"""Fixed phase within the jitter window, so jobs with the same interval don't all fire together"""
+	owner: QWidget | None = None
+	"""Skipped while this widget is hidden"""
+	enabled: bool = True
+	asynchronous: bool = False
+	"""Duration is measured up to Scheduler.job_done instead of until the callback returns"""
+	wall_clock: bool = False
+	"""Runs on real time, also when the scheduler is sped up for a replay"""
+
+	next_run: float = 0.0
+	last_run: float | None = None
+	last_duration: float | None = None
+	missed: bool = False
+	"""A run was skipped because the owner was hidden"""
+	_started_at: float | None = field(default=None, repr=False)
+
+	def paused(self) -> bool:
+		return self.owner is not None and not self.owner.isVisible()
+
+
+class Scheduler(QObject):
+	"""
+	Owns every periodic job in the application, and runs them off one timer.
+
+	Aligned jobs fire on wall-clock boundaries (a 60s aligned job runs at :00 every minute).
+	Jobs with jitter get a fixed offset within it, spread out so they don't fire in the same event loop pass.
+	Jobs whose owner widget is hidden are skipped, and run as soon as it shows again.
+	"""
+	jobs_changed = Signal()
+
+	log = logging.getLogger("Scheduler")
+
+	def __init__(self, speed: float = 1.0) -> None:
+		super().__init__()
+		self.speed = speed
+		"""Intervals are divided by this, to run hours of replayed data in minutes. Not those of wall_clock jobs"""
+		self._jobs: dict[str, Job] = {}
+		self._jittered = 0
+
+		self._timer = QTimer(self)
+		self._timer.setSingleShot(True)
+		self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+		self._timer.timeout.connect(self._on_timeout)
+
+	def add(
+		self,
+		name: str,
+		interval: float,
+		callback: Callable[[], None],
+		align: bool = False,
+		jitter: float = 0.0,
+		owner: QWidget | None = None,
+		enabled: bool = True,
+		asynchronous: bool = False,
+		wall_clock: bool = False,
+	) -> Job:
+		offset = 0.0
+		if jitter > 0:
+			offset = jitter * ((self._jittered * _GOLDEN) % 1.0)
+			self._jittered += 1
+
+		job = Job(name, interval, callback, align=align, offset=offset, owner=owner, enabled=enabled, asynchronous=asynchronous, wall_clock=wall_clock)
+		job.next_run = self._next_after(job, time.time())
+		self._jobs[name] = job
+
+		if owner is not None:
+			owner.installEventFilter(self)
+			# Only forget it, the scheduler may be going down with the owner
+			owner.destroyed.connect(lambda: self._jobs.pop(name, None))
+
+		self._arm()
+		return job
+
+	def remove(self, name: str) -> None:
+		if self._jobs.pop(name, None) is not None:
+			self._arm()
+
+	def set_enabled(self, name: str, enabled: bool) -> None:
+		job = self._jobs[name]
+		job.enabled = enabled
+		if enabled:
+			job.next_run = self._next_after(job, time.time())
+		self._arm()
+
+	def set_interval(self, name: str, interval: float) -> None:
+		job = self._jobs[name]
+		job.interval = interval
+		job.next_run = self._next_after(job, job.last_run or time.time())
+		self._arm()
+
+	def reschedule(self, name: str, delay: float) -> None:
+		"""Moves only the next run, later runs go back to the normal interval"""
+		self._jobs[name].next_run = time.time() + delay
+		self._arm()
+
+	def trigger(self, name: str) -> None:
+		"""Runs the job now, and counts the next interval from here"""
+		self._run(self._jobs[name], time.time())
+		self._arm()
+
+	def job_done(self, name: str) -> None:
+		"""Ends the duration measurement of an asynchronous job"""
+		job = self._jobs.get(name)
+		if job is None or job._started_at is None:
+			return
+		job.last_duration = time.perf_counter() - job._started_at
+		job._started_at = None
+		self.jobs_changed.emit()
+
+	def jobs(self) -> list[Job]:
+		return list(self._jobs.values())
+
+	def _next_after(self, job: Job, now: float) -> float:
+		speed = 1.0 if job.wall_clock else self.speed
+		interval = job.interval / speed
+		offset = job.offset / speed
+		if job.align:
+			return (math.floor((now - offset) / interval) + 1) * interval + offset
+		if job.last_run is None:
+			return now + interval + offset
+		return now + interval
+
+	def _run(self, job: Job, now: float) -> None:
+		job.last_run = now
+		job.missed = False
+		start = time.perf_counter()
+		try:
+			job.callback()
+		except Exception:
+			self.log.exception(f"Job {job.name} raised")
+
+		if job.asynchronous:
+			job._started_at = start
+		else:
+			job.last_duration = time.perf_counter() - start
+		job.next_run = self._next_after(job, now)
+
+	def _on_timeout(self) -> None:
+		now = time.time()
+		for job in list(self._jobs.values()):
+			if not job.enabled or job.next_run > now:
+				continue
+
+			if job.paused():
+				job.missed = True
+				job.next_run = self._next_after(job, now)
+				continue
+
+			self._run(job, now)
+
+		self._arm()
+
+	def _arm(self) -> None:
+		pending = [job.next_run for job in self._jobs.values() if job.enabled]
+		if pending:
+			delay = max(0.0, min(pending) - time.time())
+			self._timer.start(math.ceil(delay * 1000))
+		else:
+			self._timer.stop()
+		self.jobs_changed.emit()
+
+	def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+		if event.type() == QEvent.Type.Show:
+			for job in self._jobs.values():
+				if job.owner is watched and job.missed and job.enabled:
+					# Catch up on what was skipped while hidden
+					job.next_run = time.time()
+			self._arm()
+		return super().eventFilter(watched, event)
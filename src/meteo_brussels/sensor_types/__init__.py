@@ -1,8 +1,55 @@
-from pydantic import BaseModel
+from typing import Any, Self
+from pydantic import BaseModel, PrivateAttr, model_validator
 from .readings import *
+from .records import *
 
 
 class MeteoDocument(BaseModel):
 	timepoints: dict[str, Reading]
 	currentLabel: str
 	rangeValues: list[str]
+
+	_records: dict[str, ReadingRecord] = PrivateAttr(default_factory=dict)
+
+	def reading(self, label: str) -> Reading:
+		return self.timepoints[label]
+
+	def record(self, label: str) -> ReadingRecord:
+		"""The compact copy the widgets use, made once per timepoint"""
+		if label not in self._records:
+			self._records[label] = ReadingRecord.from_model(self.reading(label))
+		return self._records[label]
+
+class LazyMeteoDocument(BaseModel):
+	"""
+	Same shape as MeteoDocument, but only the current timepoint is validated up front.
+	The others stay raw and are validated, once, when asked for through reading()
+	"""
+	timepoints: dict[str, dict[str, Any]]
+	currentLabel: str
+	rangeValues: list[str]
+
+	_readings: dict[str, Reading] = PrivateAttr(default_factory=dict)
+	_records: dict[str, ReadingRecord] = PrivateAttr(default_factory=dict)
+
+	@model_validator(mode='after')
+	def _validate_current(self) -> Self:
+		self.reading(self.currentLabel)
+		return self
+
+	def reading(self, label: str) -> Reading:
+		if label not in self._readings:
+			self._readings[label] = Reading.model_validate(self.timepoints[label])
+		return self._readings[label]
+
+	def record(self, label: str) -> ReadingRecord:
+		if label not in self._records:
+			self._records[label] = ReadingRecord.from_model(self.reading(label))
+		return self._records[label]
+
+class BatcEnvelope(BaseModel):
+	"""The API response as a whole, so it can be validated straight from the bytes"""
+	data: MeteoDocument
+
+class LazyBatcEnvelope(BaseModel):
+	data: LazyMeteoDocument
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, BeforeValidator
+from pydantic import BaseModel, Field, BeforeValidator, ValidationError, ValidatorFunctionWrapHandler, WrapValidator
 from typing import Literal, Any
 from typing import Annotated
 from .meteo_reading import MeteoReadings
@@ -34,6 +34,18 @@ class TailCrossWind(BaseModel):
 	def __str__(self) -> str:
 		return f"{self.tail_wind}T{self.cross_wind}X"
 
+class SensorGraph(BaseModel):
+	"""The recent history BATC sends with each runway sensor, one list of values per series, matching labels"""
+	labels: list[str] = []
+	series: dict[str, list[float | None]]
+
+def _graph_or_none(value: Any, handler: ValidatorFunctionWrapHandler) -> SensorGraph | None:
+	# Never fail a whole reading over a graph we can't read
+	try:
+		return handler(value)
+	except ValidationError:
+		return None
+
 class BaseSensorData(BaseModel):
 	sensor_reading: SensorReading
 
@@ -44,7 +56,7 @@ class RunwaySensorData(BaseSensorData):
 	sensor_type: Literal['runway']
 	sensor_reading: SensorReading
 	sensor_wind: TailCrossWind
-	sensor_graph: dict[str, Any]
+	sensor_graph: Annotated[SensorGraph | None, WrapValidator(_graph_or_none)] = None
 
 	def to_human(self) -> str:
 		return super().to_human() + f" {self.sensor_wind}"
@@ -0,0 +1,205 @@
+"""
+Compact, immutable copies of the validated pydantic models, which is what the widgets work with.
+Pydantic only checks what comes in over the wire, these are cheap enough to keep thousands of in memory
+"""
+import sys
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Self
+import numpy as np
+from .readings import InnerWind, SensorReading, TailCrossWind, RunwaySensorData, SensorGraph, SensorDetail, WindObservationTimed, Reading
+from .meteo_reading import StatsMeteoReading, StatsWindIconReading
+
+@dataclass(frozen=True, slots=True)
+class WindRecord:
+	wind_speed: int
+	wind_direction: int
+	wind_direction_deviation_left: int
+	wind_direction_deviation_right: int
+	wind_gust: int
+
+	@staticmethod
+	def _wind(model: InnerWind) -> tuple[int, int, int, int, int]:
+		return (
+			model.wind_speed,
+			model.wind_direction,
+			model.wind_direction_deviation_left,
+			model.wind_direction_deviation_right,
+			model.wind_gust,
+		)
+
+	def to_human(self) -> str:
+		return f"{self.wind_speed}G{self.wind_gust}KT{self.wind_direction} {self.wind_direction_deviation_left}V{self.wind_direction_deviation_right}"
+
+@dataclass(frozen=True, slots=True)
+class SensorRecord(WindRecord):
+	type: str
+	label: str
+	date: int
+
+	@classmethod
+	def from_model(cls, model: SensorReading) -> Self:
+		# The same few labels come in every refresh, share them
+		return cls(*cls._wind(model), sys.intern(model.type), sys.intern(model.label), model.date)
+
+@dataclass(frozen=True, slots=True)
+class ForecastRecord(WindRecord):
+	runway: str
+	time: str
+
+	@classmethod
+	def from_model(cls, model: WindObservationTimed) -> Self:
+		return cls(*cls._wind(model), sys.intern(model.runway), sys.intern(model.time))
+
+@dataclass(frozen=True, slots=True)
+class WindIconRecord(WindRecord):
+	runway: str
+
+	@classmethod
+	def from_model(cls, model: StatsWindIconReading) -> Self:
+		return cls(*cls._wind(model), sys.intern(model.runway))
+
+@dataclass(frozen=True, slots=True)
+class StatRecord:
+	icon: str
+	title: str
+	description: str
+
+	@classmethod
+	def from_model(cls, model: StatsMeteoReading) -> Self:
+		return cls(sys.intern(model.icon), sys.intern(model.title), model.description)
+
+@dataclass(frozen=True, slots=True)
+class TailCrossRecord:
+	tail_wind: float
+	cross_wind: float
+
+	def __str__(self) -> str:
+		return f"{self.tail_wind}T{self.cross_wind}X"
+
+class GraphRecord:
+	"""
+	A sensor graph, each series a float32 array instead of a list of Python floats.
+	Missing values are NaN
+	"""
+	__slots__ = ("labels", "_series")
+
+	def __init__(self, labels: tuple[str, ...], series: dict[str, np.ndarray]) -> None:
+		self.labels = labels
+		self._series = series
+
+	@classmethod
+	def from_model(cls, graph: SensorGraph) -> Self:
+		return cls(
+			tuple(sys.intern(label) for label in graph.labels),
+			{sys.intern(name): np.array(values, dtype=np.float32) for (name, values) in graph.series.items()},
+		)
+
+	def names(self) -> list[str]:
+		return list(self._series)
+
+	def series(self, name: str) -> np.ndarray | None:
+		return self._series.get(name)
+
+	def __len__(self) -> int:
+		return max((len(values) for values in self._series.values()), default=len(self.labels))
+
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, GraphRecord):
+			return NotImplemented
+		return self.labels == other.labels and self._series.keys() == other._series.keys() and all(
+			np.array_equal(values, other._series[name], equal_nan=True) for (name, values) in self._series.items()
+		)
+
+	def __repr__(self) -> str:
+		return f"GraphRecord({len(self)} points, series={self.names()})"
+
+@dataclass(frozen=True, slots=True)
+class SensorDetailRecord:
+	sensor_type: str
+	"""'runway' or 'sensor', only runway sensors have sensor_wind and sensor_graph"""
+	sensor_reading: SensorRecord
+	sensor_wind: TailCrossRecord | None = None
+	sensor_graph: GraphRecord | None = None
+
+	@classmethod
+	def from_model(cls, model: SensorDetail) -> Self:
+		reading = SensorRecord.from_model(model.sensor_reading)
+		if isinstance(model, RunwaySensorData):
+			wind = TailCrossRecord(model.sensor_wind.tail_wind, model.sensor_wind.cross_wind)
+			return cls(sys.intern(model.sensor_type), reading, wind, GraphRecord.from_model(model.sensor_graph) if model.sensor_graph is not None else None)
+		return cls(sys.intern(model.sensor_type), reading)
+
+	def is_runway(self) -> bool:
+		return self.sensor_wind is not None
+
+	def to_human(self) -> str:
+		if self.sensor_wind is None:
+			return self.sensor_reading.to_human()
+		return self.sensor_reading.to_human() + f" {self.sensor_wind}"
+
+RUNWAY_PREFIX = "runway-"
+
+@dataclass(frozen=True, slots=True)
+class RunwayIndex:
+	"""
+	Which sensors are runways, sorted by display name ('01', '07L', ...), and which are plain anemometers.
+	Readings with the same set of sensors share one, so it is only built when the sensors change
+	"""
+	runway_keys: tuple[str, ...]
+	"""Sensor keys, 'runway-01' and so on"""
+	names: tuple[str, ...]
+	"""Display names, in the same order as runway_keys"""
+	anemometer_keys: tuple[str, ...]
+
+	@staticmethod
+	@cache
+	def for_keys(keys: tuple[str, ...]) -> "RunwayIndex":
+		runway_keys = sorted((key for key in keys if key.startswith(RUNWAY_PREFIX)), key=RunwayIndex.name)
+		return RunwayIndex(
+			tuple(runway_keys),
+			tuple(sys.intern(RunwayIndex.name(key)) for key in runway_keys),
+			tuple(key for key in keys if not key.startswith(RUNWAY_PREFIX)),
+		)
+
+	@staticmethod
+	def name(key: str) -> str:
+		return key.removeprefix(RUNWAY_PREFIX)
+
+	@staticmethod
+	def key(name: str) -> str:
+		return RUNWAY_PREFIX + name
+
+@dataclass(frozen=True, slots=True)
+class ReadingRecord:
+	wind_sensor_detail: dict[str, SensorDetailRecord]
+	wind_forecast: tuple[ForecastRecord, ...]
+	meteo_date: int
+	stats: tuple[StatRecord, ...]
+	wind_icons: tuple[WindIconRecord, ...]
+	runway_index: RunwayIndex
+	wind_aloft: dict[str, Any] | None = None
+
+	@classmethod
+	def from_model(cls, model: Reading) -> Self:
+		readings = model.meteo_readings.readings
+		detail = {sys.intern(key): SensorDetailRecord.from_model(detail) for (key, detail) in model.wind_sensor_detail.items()}
+		return cls(
+			detail,
+			tuple(ForecastRecord.from_model(slot) for slot in model.wind_forecast.forecast_slots),
+			model.meteo_readings.date,
+			tuple(StatRecord.from_model(r) for r in readings if isinstance(r, StatsMeteoReading)),
+			tuple(WindIconRecord.from_model(r) for r in readings if isinstance(r, StatsWindIconReading)),
+			RunwayIndex.for_keys(tuple(detail)),
+			model.wind_aloft,
+		)
+
+	def runway(self, name: str) -> SensorDetailRecord:
+		return self.wind_sensor_detail[RunwayIndex.key(name)]
+
+	def runways(self) -> list[tuple[str, SensorDetailRecord]]:
+		"""(display name, sensor) for every runway sensor, in order"""
+		return [(name, self.wind_sensor_detail[key]) for (name, key) in zip(self.runway_index.names, self.runway_index.runway_keys)]
+
+	def anemometers(self) -> list[tuple[str, SensorDetailRecord]]:
+		return [(key, self.wind_sensor_detail[key]) for key in self.runway_index.anemometer_keys]
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from api_calls import PAGE_PATH, API_PATH
+from .documents import make_response
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+@dataclass
+class StandInConfig:
+	latency: float = 0.0
+	"""Seconds added to every response"""
+	jitter: float = 0.0
+	"""Up to this many seconds more, uniformly random"""
+	error_rate: float = 0.0
+	"""Fraction of requests answered with a 503"""
+	publish_every: float = 120.0
+	"""Seconds before the next BATC document replaces the current one"""
+
+class Corpus():
+	"""BATC response bodies and METAR strings to replay, in order, wrapping around at the end"""
+	def __init__(self, batc: list[bytes], metar: list[str]) -> None:
+		if not batc or not metar:
+			raise ValueError("A corpus needs at least one BATC document and one METAR")
+		self.batc = batc
+		self.metar = metar
+
+	@classmethod
+	def from_directory(cls, directory: Path = FIXTURES) -> "Corpus":
+		"""Reads batc-*.json response bodies and a metar.txt with one METAR per line"""
+		batc = [path.read_bytes() for path in sorted(directory.glob("batc-*.json"))]
+		metar = [line.strip() for line in (directory / "metar.txt").read_text().splitlines() if line.strip()]
+		return cls(batc, metar)
+
+	@classmethod
+	def synthetic(cls, count: int = 10, timepoints: int = 36, graph_points: int = 30) -> "Corpus":
+		"""Generated documents of a chosen size, each one a publication later than the one before"""
+		batc = [make_response(timepoints=timepoints, graph_points=graph_points, seed=i, start=1_760_000_000 + i * 120) for i in range(count)]
+		return cls(batc, cls.from_directory().metar)
+
+class StandInServer(ThreadingHTTPServer):
+	"""
+	Serves the BATC page and API paths, and METARs at /<ICAO>, from a Corpus.
+	Point both --batc-url and --metar-url at it to run fully offline
+	"""
+	daemon_threads = True
+	log = logging.getLogger("StandInServer")
+
+	def __init__(self, corpus: Corpus, config: StandInConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+		super().__init__((host, port), _Handler)
+		self.corpus = corpus
+		self.config = config or StandInConfig()
+		self._started = time.monotonic()
+		self._random = random.Random()
+		self._random_lock = threading.Lock()
+
+	@property
+	def url(self) -> str:
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def publication(self) -> int:
+		return int((time.monotonic() - self._started) // self.config.publish_every)
+
+	def roll(self) -> tuple[float, bool]:
+		"""Delay for this request, and whether it should fail"""
+		with self._random_lock:
+			delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+			fail = self._random.random() < self.config.error_rate
+		return delay, fail
+
+	def start_in_thread(self) -> threading.Thread:
+		thread = threading.Thread(target=self.serve_forever, name="StandInServer", daemon=True)
+		thread.start()
+		return thread
+
+@lru_cache(maxsize=64)
+def _etag(body: bytes) -> str:
+	return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+class _Handler(BaseHTTPRequestHandler):
+	server: StandInServer
+
+	def do_GET(self) -> None:
+		delay, fail = self.server.roll()
+		if delay:
+			time.sleep(delay)
+		if fail:
+			self._send(503, b"Service Unavailable", "text/plain")
+			return
+
+		path = self.path.split("?", 1)[0]
+		corpus = self.server.corpus
+		publication = self.server.publication()
+
+		if path == PAGE_PATH:
+			self._send(200, b"<html><body>Meteo readings</body></html>", "text/html", {"Set-Cookie": "standin=1; Path=/"})
+		elif path == API_PATH:
+			body = corpus.batc[publication % len(corpus.batc)]
+			etag = _etag(body)
+			if self.headers.get("If-None-Match") == etag:
+				self._send(304, b"", "application/json", {"ETag": etag})
+			else:
+				self._send(200, body, "application/json", {"ETag": etag})
+		elif len(path) == 5 and path[1:].isalnum():
+			self._send(200, corpus.metar[publication % len(corpus.metar)].encode(), "text/plain")
+		else:
+			self._send(404, b"Not Found", "text/plain")
+
+	def _send(self, status: int, body: bytes, content_type: str, headers: dict[str, str] | None = None) -> None:
+		self.send_response(status)
+		self.send_header("Content-Type", content_type)
+		self.send_header("Content-Length", str(len(body)))
+		for (key, value) in (headers or {}).items():
+			self.send_header(key, value)
+		self.end_headers()
+		if status != 304:
+			self.wfile.write(body)
+
+	def log_message(self, format: str, *args) -> None:
+		self.server.log.debug(format % args)
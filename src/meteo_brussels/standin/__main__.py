@@ -0,0 +1,36 @@
+import argparse
+import logging
+from pathlib import Path
+
+from . import Corpus, StandInConfig, StandInServer, FIXTURES
+
+def main() -> None:
+	parser = argparse.ArgumentParser(prog="python -m standin", description="Local stand-in for the BATC and METAR endpoints")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8080)
+	parser.add_argument("--fixtures", type=Path, default=FIXTURES, help="Directory with batc-*.json and metar.txt to replay")
+	parser.add_argument("--synthetic", type=int, metavar="TIMEPOINTS", help="Serve generated documents with this many timepoints instead")
+	parser.add_argument("--graph-points", type=int, default=30, help="Length of each sensor graph series in generated documents")
+	parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+	parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, random per request")
+	parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+	parser.add_argument("--publish-every", type=float, default=120.0, help="Seconds between new documents")
+	args = parser.parse_args()
+
+	logging.basicConfig(level=logging.DEBUG)
+
+	if args.synthetic:
+		corpus = Corpus.synthetic(timepoints=args.synthetic, graph_points=args.graph_points)
+	else:
+		corpus = Corpus.from_directory(args.fixtures)
+
+	config = StandInConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, publish_every=args.publish_every)
+	server = StandInServer(corpus, config, args.host, args.port)
+	print(f"Serving on {server.url}, run with --batc-url {server.url} --metar-url {server.url}")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,88 @@
+"""Synthetic, but realistically shaped, BATC documents for the stand-in server and benchmarks"""
+import json
+import math
+import random
+from typing import Any
+
+RUNWAYS = {"01": 14, "19": 194, "07L": 64, "25R": 244, "07R": 64, "25L": 244}
+ANEMOMETERS = ["sensor-ebbr-1", "sensor-ebbr-2"]
+
+
+def _wind(rng: random.Random) -> dict[str, int]:
+	speed = rng.randint(3, 25)
+	return {
+		"wind_speed": speed,
+		"wind_direction": rng.randrange(10, 361, 10),
+		"wind_direction_deviation_left": rng.randint(0, 40),
+		"wind_direction_deviation_right": rng.randint(0, 40),
+		"wind_gust": speed + rng.randint(0, 12),
+	}
+
+
+def _graph(rng: random.Random, points: int) -> dict[str, Any]:
+	return {
+		"labels": [f"{(i * 2) // 60:02d}:{(i * 2) % 60:02d}" for i in range(points)],
+		"series": {
+			name: [round(rng.uniform(0, 30), 1) for _ in range(points)]
+			for name in ("wind_speed", "wind_gust", "wind_direction", "cross_wind", "tail_wind")
+		},
+	}
+
+
+def make_reading(rng: random.Random, date: int, graph_points: int = 30) -> dict[str, Any]:
+	detail: dict[str, Any] = {}
+	for (runway, heading) in RUNWAYS.items():
+		wind = _wind(rng)
+		delta = math.radians(wind["wind_direction"] - heading)
+		detail[f"runway-{runway}"] = {
+			"sensor_type": "runway",
+			"sensor_reading": {**wind, "type": "runway", "label": runway, "date": date},
+			"sensor_wind": {
+				"tailWind": round(wind["wind_speed"] * math.cos(delta), 1),
+				"crossWind": round(wind["wind_speed"] * math.sin(delta), 1),
+			},
+			"sensor_graph": _graph(rng, graph_points),
+		}
+	for (idx, key) in enumerate(ANEMOMETERS):
+		detail[key] = {
+			"sensor_type": "sensor",
+			"sensor_reading": {**_wind(rng), "type": "sensor", "label": idx + 1, "date": date},
+		}
+
+	return {
+		"wind_forecast": {
+			"forecast_slots": [
+				{**_wind(rng), "runway": runway, "time": f"{h:02d}:00"}
+				for h in range(0, 24, 3)
+				for runway in RUNWAYS
+			],
+		},
+		"wind_sensor_detail": detail,
+		"wind_aloft": None,
+		"meteo_readings": {
+			"date": date,
+			"readings": [
+				{"type": "stats", "icon": "temp", "title": "Temperature", "description": "12°C"},
+				{"type": "stats", "icon": "qnh", "title": "QNH", "description": "1013"},
+				*({"type": "wind_icon", **_wind(rng), "runway": r} for r in RUNWAYS),
+			],
+		},
+	}
+
+
+def make_document(timepoints: int = 36, graph_points: int = 30, seed: int = 0, start: int = 1_760_000_000) -> dict[str, Any]:
+	"""The 'data' part of a BATC response, with one reading every 2 minutes"""
+	rng = random.Random(seed)
+	labels = []
+	readings = {}
+	for i in range(timepoints):
+		date = start + i * 120
+		label = f"{(date // 3600) % 24:02d}:{(date // 60) % 60:02d}"
+		labels.append(label)
+		readings[label] = make_reading(rng, date, graph_points)
+
+	return {"timepoints": readings, "currentLabel": labels[-1], "rangeValues": labels}
+
+
+def make_response(**kwargs: Any) -> bytes:
+	return json.dumps({"data": make_document(**kwargs)}).encode()
@@ -0,0 +1,95 @@
+import json
+import logging
+import time
+from importlib.metadata import version, PackageNotFoundError
+from pathlib import Path
+from typing import Any, Callable
+from PySide6.QtCore import QObject, Signal
+
+from api_calls import BatcAPI, MetarAPI
+from api_calls.worker import SingleFlightWorker
+
+def _version() -> str:
+	try:
+		return version("meteo-brussels")
+	except PackageNotFoundError:
+		return "dev"
+
+class StartupOrchestrator(QObject):
+	"""
+	Starts the cookie setup + first BATC fetch and the METAR fetch the moment the process is up,
+	so they run while the widgets are still being built.
+
+	The workers are handed to MainWindow and WeatherData, which join the running fetch instead of starting their own.
+	Also measures the time from process start to the first fresh data on screen
+	"""
+	progress = Signal(str)
+
+	log = logging.getLogger("StartupOrchestrator")
+
+	def __init__(self, batc_api: BatcAPI, metar_api: MetarAPI, process_start: float, metrics_file: Path | None = None) -> None:
+		super().__init__()
+		self._process_start = process_start
+		self._metrics_file = metrics_file
+		self._marks: dict[str, float] = {}
+		self._received: dict[str, float] = {}
+		"""When the first responses came in, stamped on the worker thread"""
+
+		self.batc_fetcher = SingleFlightWorker(self._stamped("batc_received", batc_api.fetch_latest))
+		self.metar_worker = SingleFlightWorker(self._stamped("metar_received", lambda: metar_api.get_parsed("EBBR")))
+
+		self.batc_fetcher.finished.connect(lambda _: self._mark("batc_received", "Wind data received"))
+		self.batc_fetcher.failed.connect(lambda _: self.progress.emit("Wind data failed, will retry"))
+		self.metar_worker.finished.connect(lambda _: self._mark("metar_received", "METAR received"))
+		self.metar_worker.failed.connect(lambda _: self.progress.emit("METAR failed, will retry"))
+
+	def start(self) -> None:
+		self.batc_fetcher.start()
+		self.metar_worker.start()
+		self.progress.emit("Contacting BATC and VATSIM...")
+
+	def elapsed(self) -> float:
+		"""Seconds since the process started"""
+		return time.perf_counter() - self._process_start
+
+	def _stamped(self, name: str, job: Callable[[], Any]) -> Callable[[], Any]:
+		"""
+		The finished signal only reaches the GUI thread once it processes events again, after the window is built.
+		So the job notes the time itself
+		"""
+		def run() -> Any:
+			result = job()
+			self._received.setdefault(name, self.elapsed())
+			return result
+		return run
+
+	def _mark(self, name: str, message: str | None = None) -> None:
+		if name not in self._marks:
+			self._marks[name] = self._received.get(name, self.elapsed())
+		if message:
+			self.progress.emit(message)
+
+	def window_built(self) -> None:
+		self._mark("window_built", "Building wind displays... done")
+
+	def first_data_shown(self) -> None:
+		"""Call once fresh (not cached) data is on screen"""
+		if "first_data" in self._marks:
+			return
+		self._mark("first_data")
+		self.log.info(f"Time to first data: {self._marks['first_data'] * 1000:.0f}ms, {self._format_marks()}")
+
+		if self._metrics_file:
+			self._append_metrics()
+
+	def _format_marks(self) -> str:
+		return ", ".join(f"{key} at {value * 1000:.0f}ms" for (key, value) in sorted(self._marks.items(), key=lambda mark: mark[1]))
+
+	def _append_metrics(self) -> None:
+		assert self._metrics_file is not None
+		line = {"version": _version(), "at": time.time(), **{key: round(value, 4) for (key, value) in self._marks.items()}}
+		try:
+			with open(self._metrics_file, "a", encoding="utf-8") as f:
+				f.write(json.dumps(line) + "\n")
+		except OSError as e:
+			self.log.warning(f"Could not write startup metrics: {e}")
@@ -0,0 +1,81 @@
+import logging
+from dataclasses import fields
+from PySide6.QtCore import QObject, Signal
+
+from sensor_types import ReadingRecord, SensorDetailRecord, SensorRecord
+
+_READING_FIELDS = tuple(field.name for field in fields(SensorRecord))
+
+WIND_FIELDS = frozenset({
+	"wind_speed",
+	"wind_direction",
+	"wind_direction_deviation_left",
+	"wind_direction_deviation_right",
+	"wind_gust",
+	"label",
+})
+"""What a wind rose shows, a change to only the date isn't worth a redraw"""
+TAIL_CROSS_FIELDS = frozenset({"tail_wind", "cross_wind"})
+
+
+def diff_sensor(old: SensorDetailRecord, new: SensorDetailRecord) -> frozenset[str]:
+	"""Names of the fields that differ, sensor_reading and sensor_wind fields flattened into one set"""
+	if old is new:
+		return frozenset()
+
+	changed = {name for name in _READING_FIELDS if getattr(old.sensor_reading, name) != getattr(new.sensor_reading, name)}
+	if old.sensor_wind != new.sensor_wind:
+		changed.update(name for name in TAIL_CROSS_FIELDS if getattr(old.sensor_wind, name, None) != getattr(new.sensor_wind, name, None))
+	if old.sensor_type != new.sensor_type:
+		changed.add("sensor_type")
+	if old.sensor_graph is not new.sensor_graph and old.sensor_graph != new.sensor_graph:
+		changed.add("sensor_graph")
+	return frozenset(changed)
+
+
+class ReadingStore(QObject):
+	"""
+	Holds the reading on screen. Each new one is diffed against it per sensor and field,
+	so widgets can update only the sensors that changed instead of rebuilding everything.
+
+	When the set of runways changes, runways_removed and runways_added come first, widgets rebuild on those.
+	sensor_changed then follows, only for sensors that were there before and still are.
+	"""
+	sensor_changed = Signal(str, object)
+	"""Sensor key, and frozenset of the changed field names"""
+	runways_added = Signal(list)
+	runways_removed = Signal(list)
+	reading_changed = Signal()
+	"""After all the finer signals, for anything that wants the reading as a whole"""
+
+	log = logging.getLogger("ReadingStore")
+
+	reading: ReadingRecord | None = None
+
+	def set_reading(self, reading: ReadingRecord) -> None:
+		old = self.reading
+		self.reading = reading
+		if old is reading:
+			return
+
+		old_keys = old.runway_index.runway_keys if old else ()
+		new_keys = reading.runway_index.runway_keys
+		# Runway keys are sorted, equal sets give equal tuples
+		if old_keys != new_keys:
+			if removed := [key for key in old_keys if key not in new_keys]:
+				self.runways_removed.emit(removed)
+			if added := [key for key in new_keys if key not in old_keys]:
+				self.runways_added.emit(added)
+
+		if old is not None:
+			changed = 0
+			for (key, sensor) in reading.wind_sensor_detail.items():
+				previous = old.wind_sensor_detail.get(key)
+				if previous is None:
+					continue
+				if fields := diff_sensor(previous, sensor):
+					changed += 1
+					self.sensor_changed.emit(key, fields)
+			self.log.debug(f"{changed} of {len(reading.wind_sensor_detail)} sensors changed")
+
+		self.reading_changed.emit()
@@ -1,19 +1,24 @@
-from typing import cast
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtCore import Signal
-from sensor_types import Reading, SensorReading, RunwaySensorData
-from widgets.wind_rose import WindRose
+from sensor_types import ReadingRecord
+from store import ReadingStore, WIND_FIELDS
+from widgets.wind_rose.light import LightWindRose
 
 
 class ManyWindRoses(QWidget):
-	_reading: Reading
-	_show_keys: list[str] = []
-	_roses: dict[str, WindRose] = {}
+	_reading: ReadingRecord
 
 	popped_out = Signal(str)
 
-	def __init__(self) -> None:
+	def __init__(self, store: ReadingStore) -> None:
 		super().__init__()
+		# Per instance, as class attributes these would be shared by every ManyWindRoses
+		self._show_keys: list[str] = []
+		self._roses: dict[str, LightWindRose] = {}
+		self.store = store
+		store.runways_added.connect(self._on_runways_changed)
+		store.runways_removed.connect(self._on_runways_changed)
+		store.sensor_changed.connect(self._on_sensor_changed)
 		self._layout = QVBoxLayout(self)
 		self.setLayout(self._layout)
 
@@ -28,21 +33,28 @@ class ManyWindRoses(QWidget):
 			rose.deleteLater()
 			self._roses.pop(key, None)
 		
-		for (key, reading) in self._reading.wind_sensor_detail.items():
-			if "runway-" not in key:
-				continue
-
+		for key in self._reading.runway_index.runway_keys:
 			if key not in self._show_keys:
 				continue
 
+			reading = self._reading.wind_sensor_detail[key]
 			if key not in self._roses.keys():
-				self._roses[key] = WindRose()
+				self._roses[key] = LightWindRose()
 				self._roses[key].popped_out.connect(self.popped_out)
 				self._layout.addWidget(self._roses[key])
 
-			self._roses[key].set_wind(cast(RunwaySensorData, reading).sensor_reading)
+			self._roses[key].set_wind(reading.sensor_reading)
+
+	def _on_runways_changed(self, _keys: list[str]) -> None:
+		if self.store.reading is not None:
+			self.set_reading(self.store.reading)
+
+	def _on_sensor_changed(self, key: str, fields: frozenset[str]) -> None:
+		self._reading = self.store.reading
+		if key in self._roses and fields & WIND_FIELDS:
+			self._roses[key].set_wind(self._reading.wind_sensor_detail[key].sensor_reading)
 
-	def set_reading(self, reading: Reading) -> None:
+	def set_reading(self, reading: ReadingRecord) -> None:
 		self._reading = reading
 		self._render()
 
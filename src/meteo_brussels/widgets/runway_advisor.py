@@ -0,0 +1,42 @@
+import time
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+
+from runways.advisor import advise
+from store import ReadingStore
+
+class RunwayAdvisor(QTableWidget):
+	"""Every runway configuration, ranked by how far it stays within the crosswind and tailwind limits"""
+	def __init__(self, store: ReadingStore) -> None:
+		super().__init__()
+		self._store = store
+
+		self.setColumnCount(3)
+		self.setHorizontalHeaderLabels(["CONFIG", "MARGIN", "LIMITED BY"])
+		self.verticalHeader().hide()
+		self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+		self.horizontalHeader().setStretchLastSection(True)
+		self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+		self.setToolTip("Arrivals/departures, worst case at gust speed over all sensors and forecast slots")
+
+		self._store.reading_changed.connect(self._render)
+
+	def _render(self) -> None:
+		if self._store.reading is None:
+			return
+
+		start = time.perf_counter()
+		advice = advise(self._store.reading)
+		self.setRowCount(len(advice))
+		for (row, item) in enumerate(advice):
+			cells = [
+				item.configuration.name,
+				f"{item.margin:+.0f}kt",
+				f"{item.component} {item.value:.0f}kt on {item.runway}, {item.source}",
+			]
+			for (col, text) in enumerate(cells):
+				cell = QTableWidgetItem(text)
+				if item.margin < 0:
+					cell.setForeground(QColor.fromRgb(206, 60, 47))
+				self.setItem(row, col, cell)
+		self.setStatusTip(f"Scored {len(advice)} configurations in {(time.perf_counter() - start) * 1000:.1f}ms")
@@ -0,0 +1,48 @@
+from datetime import datetime
+from PySide6.QtGui import QShowEvent
+from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+
+from scheduler import Scheduler, Job
+
+class SchedulerDebug(QTableWidget):
+	"""Debug view of every scheduled job, its next run and how long the last one took"""
+	def __init__(self, scheduler: Scheduler) -> None:
+		super().__init__()
+		self._scheduler = scheduler
+
+		self.setColumnCount(5)
+		self.setHorizontalHeaderLabels(["JOB", "EVERY", "NEXT", "LAST", "STATE"])
+		self.verticalHeader().hide()
+		self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+		self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+		self._scheduler.jobs_changed.connect(self._render)
+		self._render()
+
+	def _render(self) -> None:
+		if not self.isVisible():
+			return
+
+		jobs = self._scheduler.jobs()
+		self.setRowCount(len(jobs))
+		for (row, job) in enumerate(jobs):
+			cells = [
+				job.name,
+				f"{job.interval:.0f}s",
+				datetime.fromtimestamp(job.next_run).strftime("%H:%M:%S.%f")[:-3],
+				f"{job.last_duration * 1000:.1f}ms" if job.last_duration is not None else "-",
+				_state(job),
+			]
+			for (col, text) in enumerate(cells):
+				self.setItem(row, col, QTableWidgetItem(text))
+
+	def showEvent(self, event: QShowEvent) -> None:
+		super().showEvent(event)
+		self._render()
+
+def _state(job: Job) -> str:
+	if not job.enabled:
+		return "off"
+	if job.paused():
+		return "paused"
+	return "on"
@@ -1,10 +1,10 @@
 from PySide6.QtWidgets import (QHBoxLayout, QHeaderView, QSizePolicy, QTableView, QWidget)
 
 from .model import SensorTableModel
-from sensor_types import Reading
+from sensor_types import ReadingRecord
 
 class SensorTable(QWidget):
-	def __init__(self, data: Reading | None = None):
+	def __init__(self, data: ReadingRecord | None = None):
 		super().__init__()
 
 		self.model = SensorTableModel()
@@ -27,5 +27,5 @@ class SensorTable(QWidget):
 
 		self.setLayout(self.main_layout)
 
-	def load_data(self, data: Reading | None) -> None:
+	def load_data(self, data: ReadingRecord | None) -> None:
 		self.model.load_data(data)
\ No newline at end of file
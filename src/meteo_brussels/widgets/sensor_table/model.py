@@ -1,15 +1,15 @@
 from typing import Any
 from PySide6.QtCore import QObject, QPersistentModelIndex, Qt, QAbstractTableModel, QModelIndex
 
-from sensor_types import Reading, RunwaySensorData
+from sensor_types import ReadingRecord
 
 class SensorTableModel(QAbstractTableModel):
-	sensor_data: Reading | None = None
+	sensor_data: ReadingRecord | None = None
 
 	def __init__(self) -> None:
 		super().__init__()
 
-	def load_data(self, x: Reading | None) -> None:
+	def load_data(self, x: ReadingRecord | None) -> None:
 		# It may be better to emit layoutChanged, because then the selection might remain active..
 		self.beginResetModel()
 		self.sensor_data = x
@@ -51,7 +51,7 @@ class SensorTableModel(QAbstractTableModel):
 			return items[row][1].sensor_reading.to_human()
 		elif col == 2:
 			item = items[row][1]
-			if isinstance(item, RunwaySensorData):
+			if item.sensor_wind is not None:
 				return str(item.sensor_wind)
 			else:
 				return None
@@ -1,5 +1,4 @@
 import math
-from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QGridLayout, QHBoxLayout
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -9,21 +8,27 @@ from widgets import HContainer, TitledBigLabel
 from widgets.big_label import BigLabel
 from sensor_types import MeteoDocument
 from api_calls import MetarAPI
+from api_calls.worker import SingleFlightWorker
+from api_calls.cache import ResponseCache
+from scheduler import Scheduler
 
 
 class WeatherData(QWidget):
 	_data: MeteoDocument
 	_metar: Metar.Metar | None = None
-	_api = MetarAPI()
+	_api: MetarAPI
 
-	def __init__(self) -> None:
+	def __init__(self, scheduler: Scheduler, api: MetarAPI | None = None, cache: ResponseCache | None = None, worker: SingleFlightWorker | None = None) -> None:
 		super().__init__()
 
+		self._api = api or MetarAPI()
+		self._api.cache = cache
+
 		self._layout = QVBoxLayout()
 		self.setLayout(self._layout)
 
 		# Needs Header, Wind, RVR, rest of the METAR, supplementary
-		self._header = Header()
+		self._header = Header(scheduler)
 		self._layout.addWidget(self._header, stretch=0)
 
 		self._visibility = TitledBigLabel(label="Vis")
@@ -37,18 +42,32 @@ class WeatherData(QWidget):
 
 		self._layout.addWidget(QWidget(), stretch=1)
 
-		self._timer = QTimer()
-		self._timer.timeout.connect(self._refresh_metar)
-		self._timer.start(60 * 1000)
+		# The worker may already be running, started before any widget existed
+		self._worker = worker or SingleFlightWorker(lambda: self._api.get_parsed("EBBR"))
+		self._worker.finished.connect(self._on_metar)
+		self._worker.finished.connect(lambda _: scheduler.job_done("metar"))
+		self._worker.failed.connect(lambda _: scheduler.job_done("metar"))
 
-		self._refresh_metar()
+		scheduler.add("metar", 60, self._refresh_metar, jitter=10, owner=self, asynchronous=True)
+
+		# The issue time makes it obvious when this is an old one
+		if self._worker.completed == 0 and (cached := self._api.load_cached("EBBR")):
+			self._on_metar(cached)
+
+		if self._worker.completed:
+			self._on_metar(self._worker.last_result)
+		else:
+			self._refresh_metar()
 
 	def _refresh_metar(self) -> None:
-		metar_text = self._api.get("EBBR")
-		if not metar_text:
+		# A tick while the previous request still hangs is dropped, not queued
+		self._worker.start()
+
+	def _on_metar(self, metar: Metar.Metar | None) -> None:
+		if metar is None:
 			return
 
-		self._metar = Metar.Metar(metar_text)
+		self._metar = metar
 		self._header.set_issue_time(self._metar.time)
 
 		if self._metar.vis:
@@ -62,7 +81,7 @@ class WeatherData(QWidget):
 
 
 class Header(QWidget):
-	def __init__(self) -> None:
+	def __init__(self, scheduler: Scheduler) -> None:
 		super().__init__()
 
 		self._layout = QGridLayout()
@@ -82,9 +101,8 @@ class Header(QWidget):
 		self._time = BigLabel(scaling=1.5)
 		self._layout.addWidget(self._time, 1, 3)
 
-		self._timer = QTimer()
-		self._timer.start(1000) # Once a second
-		self._timer.timeout.connect(self._on_timer)
+		# We only show minutes, so tick right on the minute
+		scheduler.add("clock", 60, self._on_timer, align=True, owner=self, wall_clock=True)
 
 		self._on_timer()
 
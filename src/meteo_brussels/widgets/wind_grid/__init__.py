@@ -2,33 +2,72 @@ from PySide6.QtGui import QResizeEvent
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGridLayout, QTableWidget
 from PySide6.QtCore import QSize, Qt
 import logging
+import numpy as np
 
-from sensor_types.readings import Reading, RunwaySensorData
+from sensor_types import ReadingRecord, SensorDetailRecord
+from store import ReadingStore, TAIL_CROSS_FIELDS
+from history import WindHistory
+from runways import headings, sector_components
 from .wind_cell import WindCell
+from .sparkline import SparklineDelegate, TrendItem, TREND_SPAN
+
+GRAPH_STEP = 120.0
+"""Seconds between the points of a server graph whose labels can't be read, they are 2 minutes apart in the ones we have seen"""
+
+def _graph_offsets(labels: tuple[str, ...], points: int) -> np.ndarray:
+	"""Seconds from each of the last `points` graph points to the newest one, from their HH:MM labels if those can be read"""
+	try:
+		minutes = np.array([int(hours) * 60 + int(mins) for (hours, mins) in (label.split(":") for label in labels[-points:])], dtype=np.float64)
+	except ValueError:
+		minutes = np.empty(0)
+	if len(minutes) != points:
+		return GRAPH_STEP * np.arange(points - 1, -1, -1, dtype=np.float64)
+	# Past midnight the clock starts over
+	steps = np.diff(minutes) % (24 * 60)
+	return 60.0 * np.append(np.cumsum(steps[::-1])[::-1], 0.0)
 
 class WindGrid(QWidget):
-	data: Reading | None = None
+	data: ReadingRecord | None = None
 	log = logging.getLogger(__name__)
 
-	def __init__(self):
+	def __init__(self, store: ReadingStore, history: WindHistory | None = None):
 		super().__init__()
+		self.store = store
+		self.history = history
+		store.runways_added.connect(self._on_runways_changed)
+		store.runways_removed.connect(self._on_runways_changed)
+		store.sensor_changed.connect(self._on_sensor_changed)
+		store.reading_changed.connect(self._on_reading_changed)
 
 		self.outer_layout = QVBoxLayout()
 		self.outer_layout.addWidget(QLabel("WIND"))
 
 		self.table = QTableWidget()
 		self.table.setSizeAdjustPolicy(self.table.SizeAdjustPolicy.AdjustToContents)
-		self.table.setColumnCount(4)
-		self.table.setHorizontalHeaderLabels(["CROSS", "MAX", "TAIL", "MAX"])
+		self.table.setColumnCount(5)
+		self.table.setHorizontalHeaderLabels(["CROSS", "MAX", "TAIL", "MAX", "TREND"])
+		self.table.setItemDelegateForColumn(4, SparklineDelegate(self.table))
 		self.render_inner()
 
 		self.outer_layout.addWidget(self.table)
 		self.setLayout(self.outer_layout)
 
-	def load_data(self, data: Reading | None) -> None:
+	def load_data(self, data: ReadingRecord | None) -> None:
 		self.data = data
 		self.render_inner()
 
+	def _on_runways_changed(self, _keys: list[str]) -> None:
+		self.load_data(self.store.reading)
+
+	def _on_sensor_changed(self, key: str, fields: frozenset[str]) -> None:
+		self.data = self.store.reading
+		if self.data is None or not fields & TAIL_CROSS_FIELDS:
+			return
+
+		keys = self.data.runway_index.runway_keys
+		if key in keys:
+			self._render_row(keys.index(key), key, self.data.wind_sensor_detail[key])
+
 	def render_inner(self) -> None:
 		for i in range(self.table.rowCount()):
 			self.table.removeRow(i)
@@ -37,15 +76,82 @@ class WindGrid(QWidget):
 			self.table.setRowCount(0)
 			return
 
-		keys = [key for key in self.data.wind_sensor_detail.keys() if "runway-" in key]
-		self.table.setRowCount(len(keys))
-		self.table.setVerticalHeaderLabels([key[len("runway-"):].upper() for key in keys])
+		runways = self.data.runways()
+		self.table.setRowCount(len(runways))
+		self.table.setVerticalHeaderLabels([name.upper() for name in self.data.runway_index.names])
+
+		for (idx, (name, item)) in enumerate(runways):
+			self._render_row(idx, name, item)
+
+	def _render_row(self, idx: int, name: str, item: SensorDetailRecord) -> None:
+		if item.sensor_wind is None:
+			self.log.warning(f"Item for sensor {name} is not of runway type?")
+			return # Should never happen
+
+		self.table.setItem(idx, 0, WindCell(item.sensor_wind.cross_wind, "")) # NO suffix, data does not contain wether its left or right
+		self.table.setItem(idx, 2, WindCell(item.sensor_wind.tail_wind, "TH"))
+
+	def _on_reading_changed(self) -> None:
+		self.data = self.store.reading
+		if not self.data:
+			return
+
+		self._render_max()
+		# Every new reading shifts the time axis, and by now it is in the history
+		self._render_trends()
+
+	def _render_max(self) -> None:
+		"""Worst case components at gust speed, anywhere in the variability sector, for all runways at once"""
+		assert self.data is not None
+		winds = [item.sensor_reading for (_name, item) in self.data.runways()]
+		if not winds:
+			return
+
+		(direction, left, right, speed, gust) = np.array([
+			(w.wind_direction, w.wind_direction_deviation_left, w.wind_direction_deviation_right, w.wind_speed, w.wind_gust)
+			for w in winds
+		], dtype=float).T
+		(cross, head) = sector_components(headings(self.data.runway_index.names), direction, left, right, np.maximum(speed, gust))
+
+		for (idx, (max_cross, min_head)) in enumerate(zip(cross.tolist(), head.tolist())):
+			if max_cross != max_cross: # NaN, heading unknown
+				self.table.takeItem(idx, 1)
+				self.table.takeItem(idx, 3)
+				continue
+			self.table.setItem(idx, 1, WindCell(max_cross, ""))
+			self.table.setItem(idx, 3, WindCell(min_head, "TH"))
+
+	def _render_trends(self) -> None:
+		assert self.data is not None
+
+		for (idx, key) in enumerate(self.data.runway_index.runway_keys):
+			if trend := self._trend(key, self.data.wind_sensor_detail[key]):
+				self.table.setItem(idx, 4, trend)
+			else:
+				self.table.takeItem(idx, 4)
+
+	def _trend(self, key: str, item: SensorDetailRecord) -> TrendItem | None:
+		"""From our own history, or the graph the server sent along if that has more to show, e.g. just after startup"""
+		trend = None
+		covered = 0.0
+		if self.history is not None and key in self.history.keys():
+			since = (self.history.latest_time() or 0.0) - TREND_SPAN
+			times = self.history.times(since)
+			if len(times) >= 2:
+				x = 1.0 - (times[-1] - times) / TREND_SPAN
+				trend = (x, self.history.column(key, "cross_wind", since), self.history.column(key, "tail_wind", since))
+				covered = float(times[-1] - times[0])
 
-		for (idx, key) in enumerate(keys):
-			item = self.data.wind_sensor_detail[key]
-			if not isinstance(item, RunwaySensorData):
-				self.log.warning(f"Item for sensor {key} is not of runway type?")
-				continue # Should never happen
+		graph = item.sensor_graph
+		if graph is not None:
+			cross = graph.series("cross_wind")
+			tail = graph.series("tail_wind")
+			if cross is not None and tail is not None and min(len(cross), len(tail)) >= 2:
+				# Right aligned like our own history, its newest point is the current reading
+				points = min(len(cross), len(tail))
+				offsets = _graph_offsets(graph.labels, points)
+				shown = offsets <= TREND_SPAN
+				if offsets[shown][0] > covered:
+					trend = (1.0 - offsets[shown] / TREND_SPAN, cross[-points:][shown], tail[-points:][shown])
 
-			self.table.setItem(idx, 0, WindCell(item.sensor_wind.cross_wind, "")) # NO suffix, data does not contain wether its left or right
-			self.table.setItem(idx, 2, WindCell(item.sensor_wind.tail_wind, "TH"))
\ No newline at end of file
+		return TrendItem(*trend) if trend else None
@@ -0,0 +1,72 @@
+import numpy as np
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QTableWidgetItem
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QTransform
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QPointF, QSize, Qt
+
+from widgets import BLUE
+
+TREND_ROLE = Qt.ItemDataRole.UserRole + 1
+TREND_SPAN = 3600.0
+"""Seconds of history in a sparkline"""
+MIN_SCALE = 10.0
+"""Knots at the top and bottom of the cell, unless the trend goes further"""
+
+CROSS_COLOR = BLUE
+TAIL_COLOR = QColor(206, 189, 84)
+
+
+def trend_path(x: np.ndarray, y: np.ndarray) -> QPainterPath:
+	"""A path in unit coordinates, x from 0 to 1 and y from -1 to 1. NaN values leave a gap"""
+	path = QPainterPath()
+	pen_down = False
+	for (px, py) in zip(x.tolist(), y.tolist()):
+		if py != py: # NaN
+			pen_down = False
+		elif pen_down:
+			path.lineTo(px, py)
+		else:
+			path.moveTo(px, py)
+			pen_down = True
+	return path
+
+
+class TrendItem(QTableWidgetItem):
+	"""
+	Cross and tail wind over time, as paths built once when the data changes.
+	SparklineDelegate only scales them to the cell, so repainting and resizing are cheap
+	"""
+	def __init__(self, x: np.ndarray, cross: np.ndarray, tail: np.ndarray):
+		super().__init__()
+		with np.errstate(invalid="ignore"):
+			scale = max(MIN_SCALE, float(np.nanmax(np.abs(np.concatenate((cross, tail))), initial=0.0)))
+		self.setData(TREND_ROLE, (trend_path(x, cross / scale), trend_path(x, tail / scale)))
+		self.setToolTip(f"Cross and tail wind, last {TREND_SPAN / 60:.0f} min, ±{scale:.0f}kt")
+
+
+class SparklineDelegate(QStyledItemDelegate):
+	def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> None:
+		super().paint(painter, option, index)
+		paths = index.data(TREND_ROLE)
+		if not paths:
+			return
+
+		rect = option.rect.adjusted(3, 3, -3, -3)
+		painter.save()
+		painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+		painter.setTransform(QTransform.fromTranslate(rect.left(), rect.center().y()).scale(rect.width(), -rect.height() / 2), True)
+
+		# Cosmetic pens keep their width whatever the scale
+		zero = QPen(option.palette.mid().color(), 1)
+		zero.setCosmetic(True)
+		painter.setPen(zero)
+		painter.drawLine(QPointF(0, 0), QPointF(1, 0))
+
+		for (path, color) in zip(paths, (CROSS_COLOR, TAIL_COLOR)):
+			pen = QPen(color, 1.5)
+			pen.setCosmetic(True)
+			painter.setPen(pen)
+			painter.drawPath(path)
+		painter.restore()
+
+	def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> QSize:
+		return QSize(80, super().sizeHint(option, index).height())
@@ -1,13 +1,16 @@
 from math import floor
 import math
-from PySide6.QtWidgets import QGraphicsScene, QGraphicsView, QGraphicsEllipseItem, QGridLayout, QSizePolicy, QPushButton, QLabel, QFrame, QGraphicsLineItem, QGraphicsTextItem, QApplication
-from PySide6.QtGui import QBrush, QColor, QPen, QResizeEvent, QShowEvent, QIcon, QTransform
-from PySide6.QtCore import QEvent, Qt, QLineF, Signal
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsView, QGraphicsEllipseItem, QGridLayout, QSizePolicy, QPushButton, QLabel, QFrame
+from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QResizeEvent, QShowEvent, QIcon
+from PySide6.QtCore import QCoreApplication, QEvent, QRectF, QSize, Qt, QLineF, Signal
 from widgets import DARK_GREEN, BLUE
 from widgets.big_label import BigLabel
 from .wind_reading import WindReading
-from sensor_types import SensorReading
+from sensor_types import SensorRecord
 from .arc import QGraphicsArcItem
+from .dial import DIALS, EXTENT, RADIUS
+
+_FIT_EVENT = QEvent.Type(QEvent.registerEventType())
 
 
 def normalise_heading(heading: int) -> int:
@@ -28,14 +31,28 @@ def normalise_heading(heading: int) -> int:
     return (- heading + 90) % 360
 
 
+class DialView(QGraphicsView):
+    """
+    Draws the dial (circle, ticks and heading labels) as one pixmap shared by all roses, over the scene,
+    instead of every rose keeping its own items for it
+    """
+    _DIAL_RECT = QRectF(-EXTENT, -EXTENT, 2 * EXTENT, 2 * EXTENT)
+
+    def drawForeground(self, painter: QPainter, rect: QRectF) -> None:
+        size = self.transform().m11() * self._DIAL_RECT.width()
+        if size < 1:
+            return
+        pixmap = DIALS.get(size, self.devicePixelRatioF(), self.palette())
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(self._DIAL_RECT, pixmap, QRectF(pixmap.rect()))
+
 
 # TODO verify its correct... I've seen some things going bad... VRB btn 300 and 000, heading 320 seems to give bad results
 class WindRose(QFrame):
     pie_width = 10.0
-    _sensor_reading: SensorReading
+    _sensor_reading: SensorRecord
     """Width of the slice showing current wind direction"""
-    _tick_items: list[QGraphicsEllipseItem | QGraphicsLineItem | QGraphicsTextItem] = []
-    _radius: int = 50
+    _radius: int = RADIUS
 
     popped_out = Signal(str)
 
@@ -51,6 +68,8 @@ class WindRose(QFrame):
 
         self._scene = QGraphicsScene()
         self._scene.setBackgroundBrush(self.palette().base())
+        # Fixed, the dial drawn over it is not part of the items' bounding rect
+        self._scene.setSceneRect(-EXTENT, -EXTENT, 2 * EXTENT, 2 * EXTENT)
 
         self.central = QGraphicsEllipseItem(-self._radius, -self._radius, 2*self._radius, 2*self._radius)
         self.central.setBrush(QBrush(DARK_GREEN))
@@ -68,8 +87,6 @@ class WindRose(QFrame):
         self._scene.addItem(self.left_arc)
         self._scene.addItem(self.right_arc)
 
-        self._draw_tick_marks()
-
         # Add placeholder orientation lines
         self.heading_line = self._scene.addLine(self._radius, self._radius, 0, 0, QPen(QColor.fromString("pink"), 0.0))
 
@@ -81,7 +98,9 @@ class WindRose(QFrame):
         self.wind_lower_line.setVisible(self.show_debug_lines)
         self.wind_upper_line.setVisible(self.show_debug_lines)
 
-        self.view = QGraphicsView(self._scene)
+        self.view = DialView(self._scene)
+        self._fitted_size = QSize()
+        self._fit_pending = False
         self._layout = QGridLayout()
 
         self.title = BigLabel(scaling=1.5)
@@ -111,7 +130,7 @@ class WindRose(QFrame):
         self._layout.setColumnStretch(3, 2)
         self.setLayout(self._layout)
 
-    def set_wind(self, reading: SensorReading) -> None:
+    def set_wind(self, reading: SensorRecord) -> None:
         self._sensor_reading = reading
 
         self._render()
@@ -148,78 +167,51 @@ class WindRose(QFrame):
         self.right_arc.setStartAngle(floor(wind_angle - self.pie_width / 2) * 16)
         self.right_arc.setSpanAngle(floor(-self._sensor_reading.wind_direction_deviation_right + self.pie_width / 2) * 16)
 
-        self._fit()
-
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         super().resizeEvent(event)
-        self._fit()
+        self._schedule_fit()
 
     def showEvent(self, event: QShowEvent) -> None:
         super().showEvent(event)
-        self._fit()
+        self._schedule_fit()
 
 
-    def get_reading(self) -> SensorReading:
+    def get_reading(self) -> SensorRecord:
         return self._sensor_reading
 
+    def _schedule_fit(self) -> None:
+        """
+        Resizes come in bursts, refit once for all of them.
+        The event is handled after this round of events but before the repaint, which Qt posts at low priority,
+        so no frame is drawn at the old scale
+        """
+        if not self._fit_pending:
+            self._fit_pending = True
+            QCoreApplication.postEvent(self, QEvent(_FIT_EVENT))
+
     def _fit(self) -> None:
-        content_rect = self._scene.sceneRect()
-        self.view.fitInView(content_rect, Qt.AspectRatioMode.KeepAspectRatio)
+        # The scene rect is fixed, so only the view's size changes the transform
+        size = self.view.viewport().size()
+        if size == self._fitted_size:
+            return
+        self._fitted_size = size
+        self.view.fitInView(self._scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
 
     def event(self, e: QEvent) -> bool:
-        if e.type() == QEvent.Type.PaletteChange:
+        if e.type() == _FIT_EVENT:
+            self._fit_pending = False
+            self._fit()
+            return True
+        elif e.type() == QEvent.Type.PaletteChange:
             self._scene.setBackgroundBrush(self.palette().base())
-            pen = QPen(self.palette().windowText(), 0.0)
-            for item in self._tick_items:
-                if isinstance(item, QGraphicsTextItem):
-                    item.setDefaultTextColor(self.palette().text().color())
-                else:
-                    item.setPen(pen)
+            # Dials for the old palette won't be asked for again
+            DIALS.clear()
+            self.view.viewport().update()
+        elif e.type() == QEvent.Type.DevicePixelRatioChange:
+            self.view.viewport().update()
         return super().event(e)
 
-    def _draw_tick_marks(self) -> None:
-        pen = QPen(self.palette().windowText(), 0.0)
-
-        self._tick_items.append(self._scene.addEllipse(-self._radius, -self._radius, 2*self._radius, 2*self._radius, pen, Qt.BrushStyle.NoBrush))
-
-        font = QApplication.font()
-        font.setPixelSize(2)
-
-        for heading in range(10, 360 + 1, 10):
-            angle = normalise_heading(heading)
-            y_heading = -math.sin(math.radians(angle))
-            x_heading = math.cos(math.radians(angle))
-
-            scale = 3 if angle % 30 == 0 else 1
-
-            y_start = y_heading * self._radius
-            y_end = y_heading * (self._radius + scale)
-            x_start = x_heading * self._radius
-            x_end = x_heading * (self._radius + scale)
-
-            self._tick_items.append(self._scene.addLine(x_start, y_start, x_end, y_end, pen))
-
-            if angle % 30 == 0:
-                txt = self._scene.addText(f"{heading:03d}", font)
-                txt.adjustSize()
-                bound = txt.sceneTransform().mapRect(txt.boundingRect())
-                txt_x = x_start
-                txt_y = y_start
-
-                if 0 <= angle < 180:
-                    txt_y -= bound.height() / 2
-
-                if heading == 360:
-                    txt_y -= bound.height() / 4
-
-                if 180 < heading < 360:
-                    txt_x -= bound.width()
-
-                txt.setPos(txt_x, txt_y)
-                self._tick_items.append(txt)
-
-
     def line_for_wind_heading(self, heading: int) -> QLineF:
         normalised_heading = normalise_heading(heading)
         y_heading = -math.sin(math.radians(normalised_heading)) * self._radius
@@ -0,0 +1,140 @@
+import math
+from collections import OrderedDict
+from enum import IntEnum
+from typing import NamedTuple
+from PySide6.QtGui import QFont, QPainter, QPalette, QPen, QPixmap
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtWidgets import QApplication
+
+RADIUS = 50
+EXTENT = 62
+"""Half the width of the scene, room for the ticks and heading labels around the circle"""
+SIZE_STEP = 8
+"""Dials are rendered for sizes rounded up to this, and scaled down a few pixels, so resizing doesn't render one per pixel"""
+
+FULL_RADIUS = 150
+"""Radius on screen, in logical pixels, from which the 2 unit heading labels are 6px high"""
+CARDINAL_RADIUS = 64
+
+
+class Detail(IntEnum):
+	"""How much of the dial is drawn, picked from its radius on screen by Detail.for_radius"""
+	COARSE = 0
+	"""A tick every 30°, no text"""
+	CARDINAL = 1
+	"""A tick every 10°, N, E, S and W"""
+	FULL = 2
+	"""A tick every 10°, the heading every 30°"""
+
+	@staticmethod
+	def for_radius(radius: float) -> "Detail":
+		"""Below CARDINAL_RADIUS even single letters don't fit outside the circle"""
+		if radius >= FULL_RADIUS:
+			return Detail.FULL
+		if radius >= CARDINAL_RADIUS:
+			return Detail.CARDINAL
+		return Detail.COARSE
+
+
+class _Geometry(NamedTuple):
+	ticks: tuple[tuple[float, float], ...]
+	"""(angle, length)"""
+	labels: tuple[tuple[str, float], ...]
+	"""(text, angle)"""
+	font_size: float
+	"""In scene units"""
+
+
+def _angle(heading: int) -> float:
+	"""Radians, counter-clockwise from 3 o'clock, like normalise_heading"""
+	return math.radians((-heading + 90) % 360)
+
+
+_GEOMETRY = {
+	Detail.FULL: _Geometry(
+		tuple((_angle(heading), 3 if heading % 30 == 0 else 1) for heading in range(10, 360 + 1, 10)),
+		tuple((f"{heading:03d}", _angle(heading)) for heading in range(30, 360 + 1, 30)),
+		2,
+	),
+	Detail.CARDINAL: _Geometry(
+		tuple((_angle(heading), 3 if heading % 90 == 0 else 1) for heading in range(10, 360 + 1, 10)),
+		tuple((text, _angle(heading)) for (text, heading) in (("N", 360), ("E", 90), ("S", 180), ("W", 270))),
+		6,
+	),
+	Detail.COARSE: _Geometry(
+		tuple((_angle(heading), 4 if heading % 90 == 0 else 2) for heading in range(30, 360 + 1, 30)),
+		(),
+		0,
+	),
+}
+"""Built once, render_dial only scales it"""
+
+
+def render_dial(size: int, device_pixel_ratio: float, palette: QPalette, detail: Detail = Detail.FULL) -> QPixmap:
+	"""The circle, ticks and labels for `detail`, for a scene of 2 * EXTENT shown `size` logical pixels wide"""
+	pixmap = QPixmap(math.ceil(size * device_pixel_ratio), math.ceil(size * device_pixel_ratio))
+	pixmap.setDevicePixelRatio(device_pixel_ratio)
+	pixmap.fill(Qt.GlobalColor.transparent)
+
+	scale = size / (2 * EXTENT)
+	def at(radius: float, angle: float) -> QPointF:
+		return QPointF((EXTENT + math.cos(angle) * radius) * scale, (EXTENT - math.sin(angle) * radius) * scale)
+
+	painter = QPainter(pixmap)
+	painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+	painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+
+	geometry = _GEOMETRY[detail]
+	pen = QPen(palette.windowText(), 0.0)
+	painter.setPen(pen)
+	painter.drawEllipse(at(0, 0), RADIUS * scale, RADIUS * scale)
+	for (angle, length) in geometry.ticks:
+		painter.drawLine(at(RADIUS, angle), at(RADIUS + length, angle))
+
+	if geometry.labels:
+		font = QFont(QApplication.font())
+		font.setPixelSize(max(1, round(geometry.font_size * scale)))
+		painter.setFont(font)
+		painter.setPen(palette.text().color())
+		metrics = painter.fontMetrics()
+
+	for (text, angle) in geometry.labels:
+		width = metrics.horizontalAdvance(text)
+		centre = at(RADIUS + 4.5, angle)
+		# Push the label out by half its own extent in that direction, so it clears the tick
+		centre += QPointF(math.cos(angle) * width / 2, -math.sin(angle) * metrics.height() / 2)
+		painter.drawText(QRectF(centre.x() - width, centre.y() - metrics.height(), 2 * width, 2 * metrics.height()), Qt.AlignmentFlag.AlignCenter, text)
+
+	painter.end()
+	return pixmap
+
+
+class DialCache():
+	"""Rendered dials, shared by every rose, for the last few (size, device pixel ratio, palette, detail) combinations"""
+	def __init__(self, max_entries: int = 16) -> None:
+		self.max_entries = max_entries
+		self._pixmaps: OrderedDict[tuple[int, float, int, Detail], QPixmap] = OrderedDict()
+
+	def get(self, size: float, device_pixel_ratio: float, palette: QPalette) -> QPixmap:
+		"""The level of detail follows from `size`, so resizing a rose switches it"""
+		size = max(SIZE_STEP, math.ceil(size / SIZE_STEP) * SIZE_STEP)
+		detail = Detail.for_radius(size * RADIUS / (2 * EXTENT))
+		key = (size, device_pixel_ratio, palette.cacheKey(), detail)
+		if key in self._pixmaps:
+			self._pixmaps.move_to_end(key)
+			return self._pixmaps[key]
+
+		pixmap = render_dial(size, device_pixel_ratio, palette, detail)
+		self._pixmaps[key] = pixmap
+		if len(self._pixmaps) > self.max_entries:
+			self._pixmaps.popitem(last=False)
+		return pixmap
+
+	def clear(self) -> None:
+		self._pixmaps.clear()
+
+	def __len__(self) -> int:
+		return len(self._pixmaps)
+
+
+DIALS = DialCache()
@@ -0,0 +1,249 @@
+from math import floor
+import math
+from PySide6.QtWidgets import QApplication, QFrame, QStyle, QStyleOptionButton
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QIcon, QMouseEvent, QPaintEvent, QPainter, QPainterPath, QPen, QResizeEvent, QTransform
+from PySide6.QtCore import QEvent, QLineF, QRect, QRectF, QSize, Qt, Signal
+from widgets import DARK_GREEN, BLUE
+from sensor_types import SensorRecord
+from . import WindRose, normalise_heading
+from .dial import DIALS, EXTENT, RADIUS, SIZE_STEP
+
+_PADDING = 4
+_BUTTON_SIZE = 24
+_ARC_WIDTH = 10.0
+_CIRCLE = QRectF(-RADIUS, -RADIUS, 2 * RADIUS, 2 * RADIUS)
+
+_HEADING_PEN = QPen(QColor.fromString("pink"), 0.0)
+_DEBUG_PEN = QPen(QColor.fromString("cyan"), 0.0)
+
+
+def _scaled_font(scaling: float) -> QFont:
+	"""Like BigLabel's"""
+	font = QApplication.font()
+	font.setPointSizeF(font.pointSizeF() * scaling)
+	return font
+
+
+def _arc(start: float, span: float) -> QPainterPath:
+	"""What WindRose's arc items show: a flat capped pen of _ARC_WIDTH on the circle, clipped to it"""
+	inner = _CIRCLE.adjusted(_ARC_WIDTH / 2, _ARC_WIDTH / 2, -_ARC_WIDTH / 2, -_ARC_WIDTH / 2)
+	path = QPainterPath()
+	path.arcMoveTo(_CIRCLE, start)
+	path.arcTo(_CIRCLE, start, span)
+	path.arcTo(inner, start + span, -span)
+	path.closeSubpath()
+	return path
+
+
+def _line(heading: int) -> QLineF:
+	angle = math.radians(normalise_heading(heading))
+	return QLineF(0, 0, math.cos(angle) * RADIUS, -math.sin(angle) * RADIUS)
+
+
+class LightWindRose(QFrame):
+	"""
+	The same rose as WindRose, painted by this one widget: no scene, view, items or labels.
+	Meant for showing many of them at once.
+
+	Paths are built in scene coordinates when the wind changes, and text boxes are laid out when the size or the text changes.
+	paintEvent only draws them
+	"""
+	pie_width = WindRose.pie_width
+	_sensor_reading: SensorRecord
+
+	popped_out = Signal(str)
+
+	def __init__(self, show_debug_lines: bool = False, can_pop_out: bool = True):
+		super().__init__()
+
+		self.show_debug_lines = show_debug_lines
+		self.can_pop_out = can_pop_out
+
+		if can_pop_out:
+			self.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Plain)
+			self.setLineWidth(2)
+
+		self._set_fonts()
+
+		self._title = ""
+		self._direction = "---°"
+		self._speed = "--kt"
+		self._lower = "---°"
+		self._upper = "---°"
+
+		# Scene coordinates, like WindRose's scene the dial spans -EXTENT to EXTENT
+		self._central = QPainterPath()
+		self._central.addEllipse(_CIRCLE)
+		self._arcs = QPainterPath()
+		self._debug_lines: tuple[tuple[QLineF, QPen], ...] = ()
+
+		# Widget coordinates
+		self._dial_area = QRect()
+		self._dial_rect = QRect()
+		self._to_widget = QTransform()
+		self._texts: list[tuple[QRect, QFont, str, Qt.AlignmentFlag, bool]] = []
+		"""Rect, font, text, alignment and whether it is boxed like a BigLabel"""
+		self._button_rect = QRect()
+		self._button_icon = QIcon.fromTheme(QIcon.ThemeIcon.WindowNew)
+
+	def set_wind(self, reading: SensorRecord) -> None:
+		self._sensor_reading = reading
+
+		texts = (
+			reading.label,
+			f"{reading.wind_direction:03d}°",
+			f"{reading.wind_speed:02d}kt",
+			f"{(reading.wind_direction - reading.wind_direction_deviation_left) % 360:03d}°",
+			f"{(reading.wind_direction + reading.wind_direction_deviation_right) % 360:03d}°",
+		)
+		if texts != (self._title, self._direction, self._speed, self._lower, self._upper):
+			(self._title, self._direction, self._speed, self._lower, self._upper) = texts
+			self._layout_texts()
+
+		# Same angles as WindRose._render, rounding included
+		wind_angle = normalise_heading(reading.wind_direction)
+		self._central = QPainterPath()
+		self._central.moveTo(0, 0)
+		self._central.arcTo(_CIRCLE, floor((wind_angle + self.pie_width / 2) * 16.0) / 16, floor((360.0 - self.pie_width) * 16) / 16)
+		self._central.closeSubpath()
+
+		self._arcs = _arc(floor(wind_angle + self.pie_width / 2), floor(reading.wind_direction_deviation_left - self.pie_width / 2))
+		self._arcs.addPath(_arc(floor(wind_angle - self.pie_width / 2), floor(-reading.wind_direction_deviation_right + self.pie_width / 2)))
+
+		self._debug_lines = (
+			(_line(reading.wind_direction), _HEADING_PEN),
+			(_line(reading.wind_direction + reading.wind_direction_deviation_left), _DEBUG_PEN),
+			(_line(reading.wind_direction - reading.wind_direction_deviation_right), _DEBUG_PEN),
+		)
+		self.update()
+
+	def set_debug(self, val: bool) -> None:
+		self.show_debug_lines = val
+		self.update()
+
+	def get_reading(self) -> SensorRecord:
+		return self._sensor_reading
+
+	def _set_fonts(self) -> None:
+		self._title_font = _scaled_font(1.5)
+		self._big_font = _scaled_font(2.0)
+		self._title_metrics = QFontMetrics(self._title_font)
+		self._big_metrics = QFontMetrics(self._big_font)
+		self._metrics = self.fontMetrics()
+
+	def _row_heights(self) -> tuple[int, int]:
+		"""Heights of the readout row and the variability row"""
+		return (self._big_metrics.height() + 2 * _PADDING, self._title_metrics.height() + 2 * _PADDING)
+
+	def _layout_texts(self) -> None:
+		rect = self.contentsRect().adjusted(_PADDING, _PADDING, -_PADDING, -_PADDING)
+		big = self._big_metrics
+		medium = self._title_metrics
+		(readout_height, vrb_height) = self._row_heights()
+		centered = Qt.AlignmentFlag.AlignCenter
+		texts = []
+
+		# VRB BTN lower AND upper, in columns stretched 1, 1, 1, 2 like WindRose's grid
+		vrb = QRect(rect.left(), rect.bottom() + 1 - vrb_height, rect.width(), vrb_height)
+		unit = vrb.width() / 5
+		for (column, font, text, boxed) in ((0, self.font(), "VRB BTN", False), (1, self._title_font, self._lower, True), (2, self.font(), "AND", False), (3, self._title_font, self._upper, True)):
+			left = vrb.left() + round(column * unit)
+			if boxed:
+				texts.append((QRect(left, vrb.top(), medium.horizontalAdvance(text) + 2 * _PADDING, vrb_height), font, text, centered, True))
+			else:
+				texts.append((QRect(left, vrb.top(), round(unit) - _PADDING, vrb_height), font, text, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, False))
+
+		# Direction and speed, centered above it
+		readout_top = vrb.top() - _PADDING - readout_height
+		widths = [big.horizontalAdvance(text) + 2 * _PADDING for text in (self._direction, self._speed)]
+		left = rect.center().x() - (sum(widths) + 5) // 2
+		for (text, width) in zip((self._direction, self._speed), widths):
+			texts.append((QRect(left, readout_top, width, readout_height), self._big_font, text, centered, True))
+			left += width + 5
+
+		# The dial takes what is left, in a multiple of SIZE_STEP so the cached dial is drawn at its own size.
+		# The title and button go over its top corners
+		self._dial_area = QRect(rect.left(), rect.top(), rect.width(), max(0, readout_top - _PADDING - rect.top()))
+		size = min(self._dial_area.width(), self._dial_area.height()) // SIZE_STEP * SIZE_STEP
+		self._dial_rect = QRect(0, 0, size, size)
+		self._dial_rect.moveCenter(self._dial_area.center())
+		scale = size / (2 * EXTENT)
+		self._to_widget = QTransform.fromTranslate(self._dial_rect.left(), self._dial_rect.top()).scale(scale, scale).translate(EXTENT, EXTENT)
+
+		if self._title:
+			texts.append((QRect(rect.left(), rect.top(), medium.horizontalAdvance(self._title) + 2 * _PADDING, vrb_height), self._title_font, self._title, centered, True))
+		self._button_rect = QRect(rect.right() + 1 - _BUTTON_SIZE, rect.top(), _BUTTON_SIZE, _BUTTON_SIZE)
+		self._texts = texts
+
+	def paintEvent(self, event: QPaintEvent) -> None:
+		super().paintEvent(event) # The frame
+
+		palette = self.palette()
+		painter = QPainter(self)
+		painter.fillRect(self._dial_area, palette.base())
+
+		if not self._dial_rect.isEmpty():
+			painter.save()
+			painter.setTransform(self._to_widget, True)
+			painter.fillPath(self._central, DARK_GREEN)
+			painter.fillPath(self._arcs, BLUE)
+			if self.show_debug_lines:
+				for (line, pen) in self._debug_lines:
+					painter.setPen(pen)
+					painter.drawLine(line)
+			painter.restore()
+			painter.drawPixmap(self._dial_rect.topLeft(), DIALS.get(self._dial_rect.width(), self.devicePixelRatioF(), palette))
+
+		painter.setPen(palette.windowText().color())
+		for (rect, font, text, alignment, boxed) in self._texts:
+			painter.setFont(font)
+			if boxed:
+				painter.drawRect(rect.adjusted(0, 0, -1, -1))
+			painter.drawText(rect, alignment, text)
+
+		if self.can_pop_out:
+			option = QStyleOptionButton()
+			option.initFrom(self)
+			option.rect = self._button_rect
+			option.icon = self._button_icon
+			option.iconSize = QSize(16, 16)
+			option.state |= QStyle.StateFlag.State_Raised
+			self.style().drawControl(QStyle.ControlElement.CE_PushButton, option, painter, self)
+		painter.end()
+
+	def mousePressEvent(self, event: QMouseEvent) -> None:
+		if self.can_pop_out and hasattr(self, "_sensor_reading") and self._button_rect.contains(event.position().toPoint()):
+			self.popped_out.emit("runway-" + self._sensor_reading.label)
+			return
+		super().mousePressEvent(event)
+
+	def resizeEvent(self, event: QResizeEvent) -> None:
+		super().resizeEvent(event)
+		self._layout_texts()
+
+	def minimumSizeHint(self) -> QSize:
+		(readout_height, vrb_height) = self._row_heights()
+		medium = self._title_metrics
+		# Every column of the variability row fits its text
+		unit = max(medium.horizontalAdvance("000°") + 2 * _PADDING, self._metrics.horizontalAdvance("VRB BTN") + _PADDING)
+		width = 5 * unit
+		margins = self.contentsMargins()
+		return QSize(
+			width + margins.left() + margins.right() + 2 * _PADDING,
+			readout_height + vrb_height + 2 * EXTENT + margins.top() + margins.bottom() + 4 * _PADDING,
+		)
+
+	def sizeHint(self) -> QSize:
+		return self.minimumSizeHint() + QSize(0, 2 * EXTENT)
+
+	def event(self, e: QEvent) -> bool:
+		if e.type() == QEvent.Type.PaletteChange:
+			# Dials for the old palette won't be asked for again
+			DIALS.clear()
+		elif e.type() == QEvent.Type.FontChange:
+			self._set_fonts()
+			self._layout_texts()
+			self.updateGeometry()
+		elif e.type() == QEvent.Type.DevicePixelRatioChange:
+			self.update()
+		return super().event(e)
@@ -1,26 +1,32 @@
 from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtCore import Qt, Signal
-from . import WindRose
-from sensor_types import SensorReading, Reading
+from .light import LightWindRose
+from sensor_types import SensorRecord, ReadingRecord
+from store import ReadingStore, WIND_FIELDS
 
 class PopOutRose(QWidget):
-	_rose: WindRose
+	_rose: LightWindRose
 	_key: str
 
 	about_to_close = Signal()
 
-	def __init__(self, key: str, reading: SensorReading):
+	def __init__(self, key: str, reading: SensorRecord, store: ReadingStore | None = None):
 		super().__init__()
 
 		self._key = key
+		self._store = store
+		if store:
+			store.sensor_changed.connect(self._on_sensor_changed)
 
 		# Window setp
 		self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint)
 		self.setWindowFlag(Qt.WindowType.Tool) # Gives it a smaller titlebar, and no taskbar entry, but also makes it not fully quit when window is closed...
 		self.setWindowTitle(self._key)
+		# Nothing else holds on to a closed pop out, free it and its rose instead of keeping them hidden
+		self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
 
-		self._rose = WindRose(can_pop_out=False)
+		self._rose = LightWindRose(can_pop_out=False)
 		
 		self._layout = QVBoxLayout()
 		self.setLayout(self._layout)
@@ -28,13 +34,17 @@ class PopOutRose(QWidget):
 
 		self.set_data(reading)
 
-	def set_data(self, reading: SensorReading) -> None:
+	def set_data(self, reading: SensorRecord) -> None:
 		self._rose.set_wind(reading)
 		self._rose.setWindowTitle(reading.label)
 
-	def set_data_from(self, reading: Reading) -> None:
+	def set_data_from(self, reading: ReadingRecord) -> None:
 		self.set_data(reading.wind_sensor_detail[self._key].sensor_reading)
 
+	def _on_sensor_changed(self, key: str, fields: frozenset[str]) -> None:
+		if self._store and self._store.reading and key == self._key and fields & WIND_FIELDS:
+			self.set_data_from(self._store.reading)
+
 	def get_key(self) -> str:
 		return self._key
 
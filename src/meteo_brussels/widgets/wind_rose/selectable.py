@@ -3,24 +3,29 @@ from PySide6.QtWidgets import QSizePolicy, QWidget, QGraphicsScene, QGraphicsVie
 from PySide6.QtGui import QBrush, QColor, QCursor, QFont, QIcon, QPalette, QPen, QRegion, QResizeEvent
 from PySide6.QtCore import QLocale, QPoint, QRect, QSize, Qt, QLineF, Signal
 from . import WindRose
-from sensor_types import Reading
+from sensor_types import ReadingRecord, RunwayIndex
+from store import ReadingStore, WIND_FIELDS
 
 class SelectableWindRose(QWidget):
-	_reading: Reading
-	_selected_key: str
-	_keys: list[str] = []
+	_reading: ReadingRecord
+	_selected_key: str = ""
 
 	selected = Signal(str)
 	popped_out = Signal(str)
 
-	def __init__(self, show_debug_lines: bool = False):
+	def __init__(self, store: ReadingStore, show_debug_lines: bool = False):
 		super().__init__()
+		self._keys: list[str] = []
+		self.store = store
+		store.runways_added.connect(self._on_runways_changed)
+		store.runways_removed.connect(self._on_runways_changed)
+		store.sensor_changed.connect(self._on_sensor_changed)
 		self.wind_rose = WindRose(show_debug_lines=show_debug_lines)
 		self.wind_rose.popped_out.connect(self.popped_out)
 
 		self.select_container = QWidget()
 		self.select_layout = QHBoxLayout(self.select_container)
-		self.button_group = QButtonGroup()
+		self.button_group = QButtonGroup(self)
 		self.button_group.setExclusive(True)
 		self.button_group.buttonToggled.connect(self._button_toggled)
 
@@ -35,13 +40,13 @@ class SelectableWindRose(QWidget):
 
 		self.setLayout(outer_layout)
 
-	def set_data(self, reading: Reading) -> None:
+	def set_data(self, reading: ReadingRecord) -> None:
 		self._reading = reading
 
-		keys = sorted([key for key in reading.wind_sensor_detail.keys() if "runway-" in key])
-		titles = [key[len("runway-"):] for key in keys]
+		keys = list(reading.runway_index.runway_keys)
+		titles = reading.runway_index.names
 
-		if keys == sorted(self._keys):
+		if keys == self._keys:
 			self._after_selection_changed()
 			return
 
@@ -62,8 +67,20 @@ class SelectableWindRose(QWidget):
 			if idx == 0:
 				button.setChecked(True)
 		
-	def _after_selection_changed(self) -> None:
+	def _on_runways_changed(self, _keys: list[str]) -> None:
+		if self.store.reading is not None:
+			self.set_data(self.store.reading)
+
+	def _on_sensor_changed(self, key: str, fields: frozenset[str]) -> None:
+		self._reading = self.store.reading
+		if key == self._selected_key and fields & WIND_FIELDS:
+			self._show_selected()
+
+	def _show_selected(self) -> None:
 		self.wind_rose.set_wind(self._reading.wind_sensor_detail[self._selected_key].sensor_reading)
+
+	def _after_selection_changed(self) -> None:
+		self._show_selected()
 		self.selected.emit(self._selected_key)
 
 	def _button_toggled(self, button: QAbstractButton, checked: bool) -> None:
@@ -71,7 +88,7 @@ class SelectableWindRose(QWidget):
 			return
 		
 		id = button.text()
-		self._selected_key = f"runway-{id}"
+		self._selected_key = RunwayIndex.key(id)
 		self._after_selection_changed()
 	
 	def set_debug(self, debug: bool) -> None:
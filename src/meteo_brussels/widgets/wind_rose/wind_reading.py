@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import QHBoxLayout, QWidget
-from sensor_types import InnerWind
+from sensor_types import WindRecord
 from widgets.big_label import BigLabel
 
 class WindReading(QWidget):
-	_data: InnerWind
+	_data: WindRecord
 	def __init__(self) -> None:
 		super().__init__()
 
@@ -18,7 +18,7 @@ class WindReading(QWidget):
 		self._layout.addWidget(self._speed, stretch=0)
 		self._layout.addStretch()
 
-	def set_data(self, wind: InnerWind):
+	def set_data(self, wind: WindRecord):
 		self._data = wind
 		self._heading.setText(f"{wind.wind_direction:03d}°")
 		self._speed.setText(f"{wind.wind_speed:02d}kt")